@@ -19,9 +19,14 @@ def home():
     if not current_user.is_authenticated:
         return redirect(url_for("auth.login"))
 
+    modules = {
+        "phrase_finder": ("Phrase Finder", "phrase_finder.phrase_finder"),
+        "text_analyzer": ("Text Analyzer", "text_analyzer.text_analyzer"),
+    }
     available_modules = {
-        "phrase_finder": ("Phrase Finder", url_for("phrase_finder.phrase_finder")),
-        "text_analyzer": ("Text Analyzer", url_for("text_analyzer.text_analyzer")),
+        module: (name, url_for(endpoint))
+        for module, (name, endpoint) in modules.items()
+        if module in config.MODULES
     }
 
     return render_template("home.html", available_modules=available_modules)
@@ -9,17 +9,122 @@ if not SECRET_KEY:
     SECRET_KEY = secrets.token_hex(16)
 
 MODULES = os.environ.get("BELINSKY_MODULES", "phrase_finder,text_analyzer").split(",")
+USER_CACHE_MAX_ENTRIES = int(os.environ.get("BELINSKY_USER_CACHE_MAX_ENTRIES", 10_000))
+USER_CACHE_TTL = float(os.environ.get("BELINSKY_USER_CACHE_TTL", 60))
+API_TOKEN_TTL = int(os.environ.get("BELINSKY_API_TOKEN_TTL", 7 * 24 * 3600))
+API_TOKEN_RATE_LIMIT = float(os.environ.get("BELINSKY_API_TOKEN_RATE_LIMIT", 50))
+NUM_WORKERS = int(os.environ.get("BELINSKY_NUM_WORKERS", 1))
 
 # Modules config
+# Phrase Finder
+PHRASE_FINDER_BATCH_SIZE = int(os.environ.get("BELINSKY_PHRASE_FINDER_BATCH_SIZE", 256))
+PHRASE_FINDER_N_PROCESS = int(os.environ.get("BELINSKY_PHRASE_FINDER_N_PROCESS", 1))
+SPACY_PRELOAD_LANGUAGES = os.environ.get(
+    "BELINSKY_SPACY_PRELOAD_LANGUAGES", "en,ru"
+).split(",")
+SPACY_MODELS_DIR = os.environ.get("BELINSKY_SPACY_MODELS_DIR")
+SPACY_MODELS_DOWNLOAD = (
+    os.environ.get("BELINSKY_SPACY_MODELS_DOWNLOAD", "true") == "true"
+)
+SPACY_MODEL_LOAD_TIMEOUT = float(os.environ.get("BELINSKY_SPACY_MODEL_LOAD_TIMEOUT", 0))
+SPACY_MODEL_RETRY_INTERVAL = float(
+    os.environ.get("BELINSKY_SPACY_MODEL_RETRY_INTERVAL", 60)
+)
+PHRASE_FINDER_STREAM_MAX_LINE_LENGTH = int(
+    os.environ.get("BELINSKY_PHRASE_FINDER_STREAM_MAX_LINE_LENGTH", 1024**2)
+)
+PHRASE_FINDER_CACHE_MAX_ENTRIES = int(
+    os.environ.get("BELINSKY_PHRASE_FINDER_CACHE_MAX_ENTRIES", 100_000)
+)
+PHRASE_FINDER_CACHE_MAX_BYTES = int(
+    os.environ.get("BELINSKY_PHRASE_FINDER_CACHE_MAX_BYTES", 64 * 1024**2)
+)
+SPACY_PIPELINE_PROFILE = os.environ.get("BELINSKY_SPACY_PIPELINE_PROFILE", "minimal")
+LANGUAGE_DETECTOR_SAMPLE_SIZE = int(
+    os.environ.get("BELINSKY_LANGUAGE_DETECTOR_SAMPLE_SIZE", 1024)
+)
+LANGUAGE_DETECTOR_EXPECTED_LANGUAGES = os.environ.get(
+    "BELINSKY_LANGUAGE_DETECTOR_EXPECTED_LANGUAGES", ",".join(SPACY_PRELOAD_LANGUAGES)
+).split(",")
+PHRASE_FINDER_RESULT_CACHE = os.environ.get("BELINSKY_PHRASE_FINDER_RESULT_CACHE", "")
+if PHRASE_FINDER_RESULT_CACHE not in ("", "memory", "redis"):
+    raise ValueError(
+        f"Unknown BELINSKY_PHRASE_FINDER_RESULT_CACHE: {PHRASE_FINDER_RESULT_CACHE}. "
+        'Please use "memory" or "redis".'
+    )
+PHRASE_FINDER_RESULT_CACHE_TTL = float(
+    os.environ.get("BELINSKY_PHRASE_FINDER_RESULT_CACHE_TTL", 3600)
+)
+PHRASE_FINDER_RESULT_CACHE_MAX_ENTRIES = int(
+    os.environ.get("BELINSKY_PHRASE_FINDER_RESULT_CACHE_MAX_ENTRIES", 10_000)
+)
+PHRASE_FINDER_RESULT_CACHE_MAX_BYTES = int(
+    os.environ.get("BELINSKY_PHRASE_FINDER_RESULT_CACHE_MAX_BYTES", 64 * 1024**2)
+)
+PHRASE_FINDER_RESULT_CACHE_REDIS_URL = os.environ.get(
+    "BELINSKY_PHRASE_FINDER_RESULT_CACHE_REDIS_URL", "redis://localhost:6379/0"
+)
+PHRASE_SETS_CACHE_MAX_ENTRIES = int(
+    os.environ.get("BELINSKY_PHRASE_SETS_CACHE_MAX_ENTRIES", 1_000)
+)
+PHRASE_SETS_CACHE_MAX_BYTES = int(
+    os.environ.get("BELINSKY_PHRASE_SETS_CACHE_MAX_BYTES", 256 * 1024**2)
+)
+PHRASE_FINDER_LEMMA_CACHE_PATH = os.environ.get(
+    "BELINSKY_PHRASE_FINDER_LEMMA_CACHE_PATH"
+)
+NLP_POOL_PROCESSES = int(os.environ.get("BELINSKY_NLP_POOL_PROCESSES", 0))
+NLP_POOL_SOCKET = os.environ.get("BELINSKY_NLP_POOL_SOCKET", "/tmp/belinsky-nlp.sock")
+
 # Text Analyzer
+TEXT_ANALYZER_BACKEND = os.environ.get("BELINSKY_TEXT_ANALYZER_BACKEND", "google")
+if TEXT_ANALYZER_BACKEND not in ("google", "local"):
+    raise ValueError(
+        f"Unknown BELINSKY_TEXT_ANALYZER_BACKEND: {TEXT_ANALYZER_BACKEND}. "
+        'Please use "google" or "local".'
+    )
+TEXT_ANALYZER_LOCAL_MODEL_PATH = os.environ.get(
+    "BELINSKY_TEXT_ANALYZER_LOCAL_MODEL_PATH"
+)
+TEXT_ANALYZER_API_ENDPOINT = os.environ.get("BELINSKY_TEXT_ANALYZER_API_ENDPOINT")
+TEXT_ANALYZER_MAX_CONCURRENCY = int(
+    os.environ.get("BELINSKY_TEXT_ANALYZER_MAX_CONCURRENCY", 16)
+)
+TEXT_ANALYZER_CHANNELS = int(os.environ.get("BELINSKY_TEXT_ANALYZER_CHANNELS", 4))
+TEXT_ANALYZER_KEEPALIVE_TIME = float(
+    os.environ.get("BELINSKY_TEXT_ANALYZER_KEEPALIVE_TIME", 60)
+)
+TEXT_ANALYZER_TIMEOUT = float(os.environ.get("BELINSKY_TEXT_ANALYZER_TIMEOUT", 10))
+TEXT_ANALYZER_CACHE_MAX_ENTRIES = int(
+    os.environ.get("BELINSKY_TEXT_ANALYZER_CACHE_MAX_ENTRIES", 10_000)
+)
+TEXT_ANALYZER_CACHE_MAX_BYTES = int(
+    os.environ.get("BELINSKY_TEXT_ANALYZER_CACHE_MAX_BYTES", 16 * 1024**2)
+)
+TEXT_ANALYZER_CACHE_TTL = float(
+    os.environ.get("BELINSKY_TEXT_ANALYZER_CACHE_TTL", 24 * 3600)
+)
 GOOGLE_CLOUD_CREDENTIALS = os.environ.get("BELINSKY_GOOGLE_CLOUD_CREDENTIALS")
 if GOOGLE_CLOUD_CREDENTIALS:
     GOOGLE_CLOUD_CREDENTIALS = json.loads(GOOGLE_CLOUD_CREDENTIALS, strict=False)
-elif "text_analyzer" in MODULES:
+elif (
+    "text_analyzer" in MODULES
+    and TEXT_ANALYZER_BACKEND == "google"
+    and not TEXT_ANALYZER_API_ENDPOINT
+):
     raise ValueError(
         'BELINSKY_GOOGLE_CLOUD_CREDENTIALS required for "text_analyzer" module, '
         "but not found in the environment."
     )
+if (
+    "text_analyzer" in MODULES
+    and TEXT_ANALYZER_BACKEND == "local"
+    and not TEXT_ANALYZER_LOCAL_MODEL_PATH
+):
+    raise ValueError(
+        'BELINSKY_TEXT_ANALYZER_LOCAL_MODEL_PATH required for "local" backend, '
+        "but not found in the environment."
+    )
 
 # Database config
 if "BELINSKY_POSTGRES_URI" in os.environ:
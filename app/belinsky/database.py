@@ -47,6 +47,12 @@ def delete_instance(model: db.Model, **kwargs) -> None:
     logger.debug(f'Deleted "{instance}" instance from database.')
 
 
+def detach_instance(instance: db.Model) -> db.Model:
+    """Detach instance from session, so commits don't expire its attributes."""
+    db.session.expunge(instance)
+    return instance
+
+
 def edit_instance(
     model: db.Model, query_filter: dict[str, t.Any], **kwargs
 ) -> db.Model:
@@ -26,3 +26,24 @@ class User(UserMixin, db.Model):
     def __repr__(self) -> str:
         """Return a string representation of user."""
         return f"<User {self.username}>"
+
+
+# pylint: disable=no-member,too-few-public-methods
+class PhraseSet(db.Model):
+    """Belinsky PhraseSet model."""
+
+    __tablename__ = "phrase_sets"
+    # Phrase set info
+    id = db.Column(db.Integer(), primary_key=True)
+    phrases = db.Column(db.JSON())
+    language = db.Column(db.String(), nullable=True)
+    user_id = db.Column(
+        db.Integer(),
+        db.ForeignKey("belinsky_db.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+    )
+
+    def __repr__(self) -> str:
+        """Return a string representation of phrase set."""
+        return f"<PhraseSet {self.id}: {len(self.phrases)} phrases>"
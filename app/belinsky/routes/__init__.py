@@ -1,13 +1,80 @@
-"""Belinsky routes blueprints."""
+"""Belinsky routes blueprints.
+
+Modules blueprints are imported on first access, so disabled modules never
+load their models and libraries.
+"""
+import importlib
+import typing as t
+
 from .auth import create_blueprint_auth, login_manager
 from .observability import create_blueprint_observability
-from .phrase_finder import create_blueprint_phrase_finder
-from .text_analyzer import create_blueprint_text_analyzer
+
+MODULES = ("phrase_finder", "text_analyzer")
+
+
+def warmup(modules: t.Iterable[str]) -> None:
+    """Create workers of modules before serving requests.
+
+    Args:
+        modules (t.Iterable): Names of enabled modules.
+    """
+
+    for module in modules:
+        importlib.import_module("." + module, __name__).warmup()
+
+
+def post_fork(modules: t.Iterable[str]) -> None:
+    """Initialize modules resources not surviving fork in worker process.
+
+    Args:
+        modules (t.Iterable): Names of enabled modules.
+    """
+
+    _call_hooks(modules, "post_fork")
+
+
+def on_starting(modules: t.Iterable[str]) -> None:
+    """Start modules processes in server master process.
+
+    Args:
+        modules (t.Iterable): Names of enabled modules.
+    """
+
+    _call_hooks(modules, "on_starting")
+
+
+def on_exit(modules: t.Iterable[str]) -> None:
+    """Stop modules processes in server master process.
+
+    Args:
+        modules (t.Iterable): Names of enabled modules.
+    """
+
+    _call_hooks(modules, "on_exit")
+
+
+def _call_hooks(modules: t.Iterable[str], name: str) -> None:
+    """Call hook of modules defining it."""
+    for module in modules:
+        hook = getattr(importlib.import_module("." + module, __name__), name, None)
+        if hook is not None:
+            hook()
+
+
+def __getattr__(name: str) -> t.Any:
+    """Import module blueprint factory on first access."""
+    module = name.removeprefix("create_blueprint_")
+    if module != name and module in MODULES:
+        return getattr(importlib.import_module("." + module, __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "login_manager",
+    "warmup",
+    "post_fork",
+    "on_starting",
+    "on_exit",
     "create_blueprint_auth",
     "create_blueprint_observability",
-    "create_blueprint_phrase_finder",
-    "create_blueprint_text_analyzer",
 ]
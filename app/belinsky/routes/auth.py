@@ -1,20 +1,64 @@
 """Belinsky authentication blueprint."""
+import functools
+import math
+import secrets
+import typing as t
+
 from flask import Blueprint, request, render_template, flash, redirect, url_for
-from flask_login import LoginManager, current_user, login_user, logout_user
-from prometheus_client import Summary
+from flask_login import (
+    LoginManager,
+    UserMixin,
+    current_user,
+    login_user,
+    logout_user,
+)
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from prometheus_client import Counter, Summary
 from werkzeug import Response
 
-from .utils import check_request_keys
-from .. import database, models
+from .utils import LRUCache, RateLimiter, check_request_keys, check_string_lists
+from .. import config, database, models
 
 # Initialize login manager
 login_manager = LoginManager()
 
+# Initialize users cache, so authenticated requests don't query database
+user_cache = LRUCache(
+    "users", config.USER_CACHE_MAX_ENTRIES, 16 * 1024**2, ttl=config.USER_CACHE_TTL
+)
+
 # Initialize prometheus metrics
 SIGNUP_LATENCY = Summary("signup_latency", 'Latency of "signup" request')
 LOGIN_LATENCY = Summary("login_latency", 'Latency of "login" request')
 LOGOUT_LATENCY = Summary("logout_latency", 'Latency of "logout" request')
 DELETE_USER_LATENCY = Summary("delete_user_latency", 'Latency of "delete-user" request')
+API_TOKENS_LATENCY = Summary("api_tokens_latency", 'Latency of "api-tokens" request')
+API_TOKENS_RATE_LIMITED = Counter(
+    "api_tokens_rate_limited", "Number of api token requests rejected by rate limit"
+)
+
+# Initialize api tokens signing and rate limiting. Every worker limits tokens
+# separately, so it allows them a share of their rate limit.
+token_serializer = URLSafeTimedSerializer(config.SECRET_KEY, salt="belinsky-api-token")
+rate_limiter = RateLimiter()
+
+
+class TokenUser(UserMixin):
+    """User authenticated by api token claims."""
+
+    def __init__(self, claims: dict[str, t.Any]):
+        """Initialize the TokenUser.
+
+        Args:
+            claims (dict): Signed token user id, username, key id, scopes
+                and rate limit.
+        """
+
+        self.id = claims["user"]
+        self.username = claims["username"]
+        self.key = claims["key"]
+        self.scopes = claims["scopes"]
+        self.rate_limit = claims["rate_limit"]
 
 
 def _get_auth_form():
@@ -170,17 +214,9 @@ def delete_user() -> tuple[dict[str, str | int], int]:
         return check
 
     # Check if user exists and password correct
-    user = database.get_instance(models.User, username=request.json["username"])
-    if not user:
-        response = {
-            "error": f"User with {request.json['username']} username not found.",
-            "status": 406,
-        }
-        return response, 406
-
-    if not user.check_password(request.json["password"]):
-        response = {"error": "Invalid password. Please try again.", "status": 406}
-        return response, 406
+    user, error = _authenticate_json()
+    if error:
+        return error
 
     # Logout if it is current user
     if (
@@ -191,6 +227,7 @@ def delete_user() -> tuple[dict[str, str | int], int]:
 
     # Delete user
     database.delete_instance(models.User, username=request.json["username"])
+    user_cache.delete(str(user.id))
 
     response = {
         "result": f"Successfully deleted {request.json['username']} user.",
@@ -199,18 +236,213 @@ def delete_user() -> tuple[dict[str, str | int], int]:
     return response, 200
 
 
+@API_TOKENS_LATENCY.time()
+def api_tokens() -> tuple[dict[str, str | list | float | int], int]:
+    """Issue signed api token.
+    ---
+    Body (JSON):
+        - username: Username.
+        - password: Password.
+        - scopes [Optional]: Modules the token is allowed to access. Defaults to all modules.
+        - rate_limit [Optional]: Requests per second of the token. Defaults to maximum.
+
+    Responses:
+        200:
+            description: Return token to be sent as "Authorization: Bearer <token>" header.
+            schema:
+                token: Api token.
+                scopes: ["phrase_finder", "text_analyzer"]
+                rate_limit: 50
+                expires_in: 604800
+                status: 200
+        400:
+            description: Json body or ['username', 'password'] keys not found in request body
+                OR ['scopes'] is not a list of strings OR ['rate_limit'] is not a number.
+            schema:
+                error: Error description.
+                status: 400
+        406:
+            description: User not found OR Invalid password OR Unknown scopes OR Invalid rate limit.
+            schema:
+                error: Error description.
+                status: 406
+    """
+
+    # Check input body
+    check = check_request_keys({"username", "password"})
+    if check:
+        return check
+
+    # Check if user exists and password correct
+    user, error = _authenticate_json()
+    if error:
+        return error
+
+    # Check token permissions
+    scopes = request.json.get("scopes", config.MODULES)
+    scopes = [scopes] if isinstance(scopes, str) else scopes
+    check = check_string_lists(scopes=scopes)
+    if check:
+        return check
+
+    unknown_scopes = set(scopes) - set(config.MODULES)
+    if unknown_scopes:
+        response = {
+            "error": f"Unknown scopes: {', '.join(sorted(unknown_scopes))}. "
+            f"Available scopes: {', '.join(config.MODULES)}.",
+            "status": 406,
+        }
+        return response, 406
+
+    rate_limit, error = _get_rate_limit_json()
+    if error:
+        return error
+
+    # Sign token with a new key id rate limited separately
+    token = token_serializer.dumps(
+        {
+            "user": user.id,
+            "username": user.username,
+            "key": secrets.token_hex(8),
+            "scopes": scopes,
+            "rate_limit": rate_limit,
+        }
+    )
+
+    response = {
+        "token": token,
+        "scopes": scopes,
+        "rate_limit": rate_limit,
+        "expires_in": config.API_TOKEN_TTL,
+        "status": 200,
+    }
+    return response, 200
+
+
+def _get_rate_limit_json() -> tuple[float | None, tuple | None]:
+    """Get api token rate limit of request json body capped by maximum.
+
+    Returns:
+        tuple:
+            Rate limit and None or None and error response.
+    """
+
+    rate_limit = request.json.get("rate_limit", config.API_TOKEN_RATE_LIMIT)
+    if isinstance(rate_limit, bool) or not isinstance(rate_limit, (int, float)):
+        response = {"error": "['rate_limit'] must be a number.", "status": 400}
+        return None, (response, 400)
+
+    if rate_limit <= 0:
+        response = {"error": "Rate limit should be a positive number.", "status": 406}
+        return None, (response, 406)
+
+    return min(rate_limit, config.API_TOKEN_RATE_LIMIT), None
+
+
+def _authenticate_json() -> tuple[models.User | None, tuple | None]:
+    """Get user by username and password of request json body.
+
+    Returns:
+        tuple:
+            User and None or None and error response.
+    """
+
+    username = request.json["username"]
+    user = database.get_instance(models.User, username=username)
+    if not user:
+        response = {
+            "error": f"User with {username} username not found.",
+            "status": 406,
+        }
+        return None, (response, 406)
+
+    if not user.check_password(request.json["password"]):
+        response = {"error": "Invalid password. Please try again.", "status": 406}
+        return None, (response, 406)
+
+    return user, None
+
+
+def scope_required(scope: str) -> t.Callable[[t.Callable], t.Callable]:
+    """Check api token scope and rate limit before calling view.
+
+    Users logged-in by session are allowed every scope without rate limit.
+
+    Args:
+        scope (str): Module name required in token scopes.
+
+    Returns:
+        t.Callable:
+            View decorator.
+    """
+
+    def decorator(func: t.Callable) -> t.Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if isinstance(current_user, TokenUser):
+                if scope not in current_user.scopes:
+                    response = {
+                        "error": f'Token is not allowed to access "{scope}".',
+                        "status": 403,
+                    }
+                    return response, 403
+
+                wait = rate_limiter.acquire(
+                    current_user.key, current_user.rate_limit / config.NUM_WORKERS
+                )
+                if wait:
+                    API_TOKENS_RATE_LIMITED.inc()
+                    response = {"error": "Rate limit exceeded.", "status": 429}
+                    return response, 429, {"Retry-After": str(math.ceil(wait))}
+
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@login_manager.request_loader
+def load_token_user(current_request) -> TokenUser | None:
+    """Authenticate request by its bearer api token of existing user."""
+    scheme, _, token = current_request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+
+    try:
+        claims = token_serializer.loads(token, max_age=config.API_TOKEN_TTL)
+    except BadSignature:
+        return None
+
+    # Reject tokens of deleted users, checked by cached users
+    if load_user(str(claims["user"])) is None:
+        return None
+    return TokenUser(claims)
+
+
 @login_manager.user_loader
 def load_user(user_id) -> database.db or None:
-    """Check if user is logged-in on every page load."""
-    if user_id is not None:
-        return database.get_instance(models.User, id=user_id)
-    return None
+    """Check if user is logged-in on every page load.
+
+    Users are cached by every worker for a short time, so deleted users stay
+    logged-in on other workers until their cache entries expire.
+    """
+
+    if user_id is None:
+        return None
+
+    user = user_cache.get(user_id)
+    if user is None:
+        user = database.get_instance(models.User, id=user_id)
+        if user is not None:
+            user_cache.set(user_id, database.detach_instance(user))
+    return user
 
 
 @login_manager.unauthorized_handler
 def unauthorized_handler() -> tuple[dict[str, str | int], int] | Response:
     """401 Unauthorized handler."""
-    if request.form.get("raw"):
+    if request.form.get("raw") or request.is_json or "Authorization" in request.headers:
         response = {"error": "Unauthorized. Please login first.", "status": 401}
         return response, 401
 
@@ -225,5 +457,6 @@ def create_blueprint_auth() -> Blueprint:
     auth_bp.add_url_rule("/login", view_func=login, methods=["GET", "POST"])
     auth_bp.add_url_rule("/logout", view_func=logout, methods=["GET", "POST"])
     auth_bp.add_url_rule("/delete-user", view_func=delete_user, methods=["GET", "POST"])
+    auth_bp.add_url_rule("/api-tokens", view_func=api_tokens, methods=["POST"])
 
     return auth_bp
@@ -1,14 +1,26 @@
 """Belinsky observability blueprint."""
 import os
+import time
 
-from flask import Blueprint
+from flask import Blueprint, Response
 from healthcheck import HealthCheck
 from healthcheck.security import safe_dict
-from prometheus_client import CollectorRegistry, generate_latest, multiprocess
+from prometheus_client import CollectorRegistry, Gauge, generate_latest, multiprocess
 
 from ..database import get_all
 from ..models import User
 
+# Initialize prometheus metrics
+WORKER_MEMORY = Gauge(
+    "worker_memory_bytes",
+    "Memory usage of worker process",
+    ["type"],
+    multiprocess_mode="liveall",
+)
+MEMORY_UPDATE_INTERVAL = 10
+# Mutable holder of last memory metrics update time
+_LAST_MEMORY_UPDATE = {"time": 0.0}
+
 
 # Create healthcheck function
 def check_database() -> tuple[bool, str]:
@@ -18,8 +30,44 @@ def check_database() -> tuple[bool, str]:
 
 
 # Create observability function
+def update_memory_metrics() -> None:
+    """Update current worker memory metrics at most once per interval."""
+    if time.monotonic() - _LAST_MEMORY_UPDATE["time"] < MEMORY_UPDATE_INTERVAL:
+        return
+    _LAST_MEMORY_UPDATE["time"] = time.monotonic()
+
+    # Shared memory shows how much of preloaded models is still copy-on-write
+    fields = {
+        "Rss": "rss",
+        "Pss": "pss",
+        "Shared_Clean": "shared",
+        "Shared_Dirty": "shared",
+        "Private_Clean": "private",
+        "Private_Dirty": "private",
+    }
+    memory = dict.fromkeys(fields.values(), 0)
+    try:
+        with open("/proc/self/smaps_rollup", encoding="utf-8") as smaps:
+            for line in smaps:
+                field, _, value = line.partition(":")
+                if field in fields:
+                    memory[fields[field]] += int(value.split()[0]) * 1024
+    except OSError:
+        return
+
+    for memory_type, value in memory.items():
+        WORKER_MEMORY.labels(memory_type).set(value)
+
+
+def update_memory_metrics_after_request(response: Response) -> Response:
+    """Update current worker memory metrics after request."""
+    update_memory_metrics()
+    return response
+
+
 def metrics_prometheus() -> tuple[bytes, int]:
     """Generate prometheus metrics response."""
+    update_memory_metrics()
     registry = CollectorRegistry()
     multiprocess.MultiProcessCollector(registry)
     data = generate_latest(registry)
@@ -49,5 +97,6 @@ def create_blueprint_observability() -> Blueprint:
     observability_bp.add_url_rule(
         "/metrics/prometheus", "prometheus", view_func=metrics_prometheus
     )
+    observability_bp.after_app_request(update_memory_metrics_after_request)
 
     return observability_bp
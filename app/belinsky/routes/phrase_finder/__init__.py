@@ -1,24 +1,168 @@
 """Belinsky PhraseFinder blueprint."""
-from flask import Blueprint, request, render_template, flash
-from flask_login import login_required
+import functools
+import sys
+import time
+import typing as t
+
+import click
+from flask import Blueprint, Response, request, render_template, flash
+from flask import stream_with_context
+from flask.cli import with_appcontext
+from flask_login import current_user, login_required
 from loguru import logger
 from prometheus_client import Summary
 
 from .formatter import bold_phrases
-from .phrase_finder import PhraseFinder, UnknownLanguageError
+from .phrase_finder import BasePhraseFinder, PhraseFinder, UnknownLanguageError
+from .matcher import PhraseMatcher
+from .pool import NLPPool, RemotePhraseFinder
+from .registry import PhraseSetRegistry
+from .stream import format_result, read_documents
+from ..auth import scope_required
+from ..utils import (
+    LanguageNotReadyError,
+    LRUCache,
+    NLPPoolUnavailableError,
+    RedisCache,
+    UnknownPhraseSetError,
+    check_optional_strings,
+    check_request_keys,
+    check_string_lists,
+    lazy_object,
+)
+from ... import config, database, models
 
 # Initialize prometheus metrics.
 PHRASE_FINDER_LATENCY = Summary(
     "phrase_finder_latency", 'Latency of "phrase-finder" request'
 )
+PHRASE_FINDER_BATCH_LATENCY = Summary(
+    "phrase_finder_batch_latency", 'Latency of "phrase-finder/batch" request'
+)
+PHRASE_FINDER_STREAM_LATENCY = Summary(
+    "phrase_finder_stream_latency",
+    'Latency of "phrase-finder/stream" request until its whole body is streamed',
+)
+PHRASE_SETS_LATENCY = Summary("phrase_sets_latency", 'Latency of "phrase-sets" request')
+
+
+def create_result_cache() -> LRUCache | RedisCache | None:
+    """Create find_phrases results cache from configuration."""
+    if config.PHRASE_FINDER_RESULT_CACHE == "memory":
+        return LRUCache(
+            "phrase_finder_results",
+            config.PHRASE_FINDER_RESULT_CACHE_MAX_ENTRIES,
+            config.PHRASE_FINDER_RESULT_CACHE_MAX_BYTES,
+            _result_nbytes,
+            config.PHRASE_FINDER_RESULT_CACHE_TTL,
+        )
+    if config.PHRASE_FINDER_RESULT_CACHE == "redis":
+        return RedisCache(
+            "phrase_finder_results",
+            config.PHRASE_FINDER_RESULT_CACHE_REDIS_URL,
+            config.PHRASE_FINDER_RESULT_CACHE_MAX_BYTES,
+            config.PHRASE_FINDER_RESULT_CACHE_TTL,
+        )
+    return None
+
+
+def _result_nbytes(result: dict[str, list[list[int]]]) -> int:
+    """Estimate size of find_phrases result in bytes."""
+    return sys.getsizeof(result) + sum(
+        sys.getsizeof(phrase)
+        + sys.getsizeof(spans)
+        + sum(sys.getsizeof(span) + sum(map(sys.getsizeof, span)) for span in spans)
+        for phrase, spans in result.items()
+    )
+
+
+def create_phrase_finder() -> PhraseFinder:
+    """Create PhraseFinder worker from configuration."""
+    return PhraseFinder(
+        batch_size=config.PHRASE_FINDER_BATCH_SIZE,
+        n_process=config.PHRASE_FINDER_N_PROCESS,
+        cache_max_entries=config.PHRASE_FINDER_CACHE_MAX_ENTRIES,
+        cache_max_bytes=config.PHRASE_FINDER_CACHE_MAX_BYTES,
+        models_dir=config.SPACY_MODELS_DIR,
+        download_models=config.SPACY_MODELS_DOWNLOAD,
+        model_load_timeout=config.SPACY_MODEL_LOAD_TIMEOUT,
+        model_retry_interval=config.SPACY_MODEL_RETRY_INTERVAL,
+        preload_languages=config.SPACY_PRELOAD_LANGUAGES,
+        language_sample_size=config.LANGUAGE_DETECTOR_SAMPLE_SIZE,
+        expected_languages=config.LANGUAGE_DETECTOR_EXPECTED_LANGUAGES,
+        pipeline_profile=config.SPACY_PIPELINE_PROFILE,
+        result_cache=create_result_cache(),
+        lemma_cache_path=config.PHRASE_FINDER_LEMMA_CACHE_PATH,
+    )
+
+
+# Initialize NLP pool.
+# With NLP pool enabled, spaCy models live only in pool processes started by gunicorn.
+if config.NLP_POOL_PROCESSES > 0:
+    nlp_pool = NLPPool(
+        config.NLP_POOL_SOCKET,
+        config.NLP_POOL_PROCESSES,
+        config.SECRET_KEY.encode(),
+        create_phrase_finder,
+    )
+else:
+    nlp_pool = None  # pylint: disable=invalid-name
 
-# Initialize PhraseFinder worker.
-phrase_finder_worker = PhraseFinder()
+
+@lazy_object
+def get_phrase_finder_worker() -> BasePhraseFinder:
+    """Get PhraseFinder worker loading spaCy models on first use."""
+    if nlp_pool is not None:
+        return RemotePhraseFinder(
+            config.NLP_POOL_SOCKET,
+            config.SECRET_KEY.encode(),
+            config.PHRASE_FINDER_BATCH_SIZE,
+            create_result_cache(),
+        )
+    return create_phrase_finder()
+
+
+@lazy_object
+def get_phrase_set_registry() -> PhraseSetRegistry:
+    """Get phrase sets registry of PhraseFinder worker."""
+    return PhraseSetRegistry(
+        get_phrase_finder_worker(),
+        config.PHRASE_SETS_CACHE_MAX_ENTRIES,
+        config.PHRASE_SETS_CACHE_MAX_BYTES,
+    )
+
+
+def on_starting() -> None:
+    """Start NLP pool owning spaCy models if enabled."""
+    if nlp_pool is not None:
+        nlp_pool.start()
+
+
+def on_exit() -> None:
+    """Stop NLP pool if enabled."""
+    if nlp_pool is not None:
+        nlp_pool.stop()
+
+
+def warmup() -> None:
+    """Create PhraseFinder worker preloading its languages models."""
+    get_phrase_set_registry()
+    logger.debug("Warmed up Phrase Finder.")
+
+
+def __getattr__(name: str) -> t.Any:
+    """Get module workers, creating them on first access."""
+    if name == "phrase_finder_worker":
+        return get_phrase_finder_worker()
+    if name == "phrase_set_registry":
+        return get_phrase_set_registry()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @PHRASE_FINDER_LATENCY.time()
 @login_required
-def phrase_finder() -> str | tuple[dict[str, str | list | int], int]:
+@scope_required("phrase_finder")
+def phrase_finder() -> str | tuple[dict[str, str | list | int], int, ...]:
     """Generate Phrase Finder home page.
 
     Returns:
@@ -31,21 +175,31 @@ def phrase_finder() -> str | tuple[dict[str, str | list | int], int]:
 
     # Process input data
     text = request.form.get("text")
-    phrases = [p for p in request.form.get("phrases").split("\r\n") if p != ""]
+    phrases = [p for p in request.form.get("phrases", "").split("\r\n") if p != ""]
+    phrase_set_id = request.form.get("phrase_set")
     found_phrases = None
 
     # Process text
     if not text:
         flash("No text given. Try again please.")
         logger.debug(f"Text not found in {request} request.")
-    elif not phrases:
+    elif not phrases and not phrase_set_id:
         flash("No phrases given. Try again please.")
         logger.debug(f"Phrases not found in {request} request.")
     else:
         try:
-            found_phrases = phrase_finder_worker.find_phrases(
-                text, phrases, request.form.get("language")
-            )
+            if phrase_set_id:
+                found_phrases = get_phrase_set_registry().find_phrases(
+                    text,
+                    _parse_phrase_set_id(phrase_set_id),
+                    current_user.id,
+                    request.form.get("language"),
+                )
+                phrases = list(found_phrases)
+            else:
+                found_phrases = get_phrase_finder_worker().find_phrases(
+                    text, phrases, request.form.get("language")
+                )
             logger.debug(
                 f"Found {found_phrases} phrases in text with {len(text)} length."
             )
@@ -54,6 +208,18 @@ def phrase_finder() -> str | tuple[dict[str, str | list | int], int]:
             logger.debug(
                 f'Unknown "{exc.language}" language caught on {request} request.'
             )
+        except UnknownPhraseSetError as exc:
+            flash(str(exc))
+            logger.debug(
+                f'Unknown "{exc.phrase_set_id}" phrase set caught on {request} request.'
+            )
+        except LanguageNotReadyError as exc:
+            flash(str(exc))
+            logger.debug(
+                f'Not ready "{exc.language}" language caught on {request} request.'
+            )
+            if request.form.get("raw"):
+                return _not_ready_response(exc)
 
     # Response with raw data if required
     if request.form.get("raw"):
@@ -77,6 +243,369 @@ def phrase_finder() -> str | tuple[dict[str, str | list | int], int]:
     )
 
 
+@PHRASE_FINDER_BATCH_LATENCY.time()
+@login_required
+@scope_required("phrase_finder")
+def phrase_finder_batch() -> tuple[dict[str, str | list | int], int, ...]:
+    """Find phrases in multiple texts.
+    ---
+    Body (JSON):
+        - texts: Texts to be processed.
+        - phrases: Phrases to be found.
+        - phrase_set [Optional]: Registered phrase set id to be used instead of phrases.
+        - language [Optional]: Language. If not provided, will be determined automatically.
+
+    Responses:
+        200:
+            description: Return found phrases for every text.
+            schema:
+                found_phrases: [{"phrase": [[0, 5]]}]
+                status: 200
+        400:
+            description: Json body or ['texts'] key not found in request body
+                OR ['texts'] or ['phrases'] is not a list of strings
+                OR ['language'] is not a string OR ['phrase_set'] is not an integer.
+            schema:
+                error: Error description.
+                status: 400
+        406:
+            description: No phrases given OR Unknown language OR Unknown phrase set.
+            schema:
+                error: Error description.
+                status: 406
+        503:
+            description: Language model is warming up.
+            schema:
+                error: Error description.
+                status: 503
+    """
+
+    # Check input body
+    check = check_request_keys({"texts"})
+    if check:
+        return check
+
+    texts = request.json["texts"]
+    if isinstance(texts, str):
+        texts = [texts]
+    phrases = request.json.get("phrases", [])
+    if isinstance(phrases, str):
+        phrases = [phrases]
+    phrase_set_id = request.json.get("phrase_set")
+    language = request.json.get("language")
+    check = (
+        check_string_lists(texts=texts, phrases=phrases)
+        or check_optional_strings(language=language)
+        or _check_phrase_set_id(phrase_set_id)
+    )
+    if check:
+        return check
+    phrases = [p for p in phrases if p != ""]
+
+    if not phrases and phrase_set_id is None:
+        response = {"error": "No phrases given. Try again please.", "status": 406}
+        return response, 406
+
+    # Process texts
+    try:
+        if phrase_set_id is not None:
+            found_phrases = get_phrase_set_registry().find_phrases_many(
+                texts, _parse_phrase_set_id(phrase_set_id), current_user.id, language
+            )
+        else:
+            found_phrases = get_phrase_finder_worker().find_phrases_many(
+                texts, phrases, language
+            )
+    except (UnknownLanguageError, UnknownPhraseSetError) as exc:
+        response = {"error": str(exc), "status": 406}
+        return response, 406
+    except LanguageNotReadyError as exc:
+        return _not_ready_response(exc)
+
+    logger.debug(f"Found phrases in {len(texts)} texts.")
+    response = {"found_phrases": found_phrases, "status": 200}
+    return response, 200
+
+
+@login_required
+@scope_required("phrase_finder")
+def phrase_finder_stream() -> Response | tuple[dict[str, str | int], int, ...]:
+    """Find phrases in a stream of texts.
+    ---
+    Query:
+        - phrases: Phrases to be found. Can be repeated.
+        - phrase_set [Optional]: Registered phrase set id to be used instead of phrases.
+        - language [Optional]: Language. If not provided, will be determined automatically.
+
+    Body (NDJSON):
+        - Documents as {"id": "Optional document id", "text": "Text to be processed"}.
+
+    Responses:
+        200:
+            description: Stream found phrases for every document as NDJSON.
+            schema:
+                id: Document id or line number.
+                found_phrases: {"phrase": [[0, 5]]}
+        406:
+            description: No phrases given OR Unknown language OR Unknown phrase set.
+            schema:
+                error: Error description.
+                status: 406
+        503:
+            description: Language model is warming up.
+            schema:
+                error: Error description.
+                status: 503
+    """
+
+    start = time.perf_counter()
+
+    # Process input data
+    phrases = [p for p in request.args.getlist("phrases") if p != ""]
+    phrase_set_id = request.args.get("phrase_set")
+    language = request.args.get("language")
+
+    if not phrases and not phrase_set_id:
+        response = {"error": "No phrases given. Try again please.", "status": 406}
+        return response, 406
+
+    # Compile phrases
+    try:
+        if phrase_set_id:
+            phrase_set_id = _parse_phrase_set_id(phrase_set_id)
+            registry = get_phrase_set_registry()
+            language = registry.get_language(phrase_set_id, current_user.id, language)
+            matchers = functools.partial(
+                registry.get_matcher, phrase_set_id, current_user.id
+            )
+        else:
+            matchers = _compile_on_demand(phrases)
+
+        if language is not None:
+            matchers(language)
+    except (UnknownLanguageError, UnknownPhraseSetError) as exc:
+        response = {"error": str(exc), "status": 406}
+        return response, 406
+    except LanguageNotReadyError as exc:
+        return _not_ready_response(exc)
+
+    documents = read_documents(
+        request.stream, config.PHRASE_FINDER_STREAM_MAX_LINE_LENGTH
+    )
+    results = _find_phrases_stream(documents, matchers, language)
+    return Response(
+        stream_with_context(_time_stream(results, start)),
+        mimetype="application/x-ndjson",
+    )
+
+
+def _time_stream(results: t.Iterator[str], start: float) -> t.Iterator[str]:
+    """Observe stream latency from request start until its whole body is sent."""
+    try:
+        yield from results
+    finally:
+        PHRASE_FINDER_STREAM_LATENCY.observe(time.perf_counter() - start)
+
+
+def _compile_on_demand(phrases: list[str]) -> t.Callable[[str], PhraseMatcher]:
+    """Create function compiling phrases once for every language."""
+    matchers: dict[str, PhraseMatcher] = {}
+
+    def get_matcher(language: str) -> PhraseMatcher:
+        if language not in matchers:
+            matchers[language] = get_phrase_finder_worker().compile_phrases(
+                phrases, language
+            )
+        return matchers[language]
+
+    return get_matcher
+
+
+def _find_phrases_stream(
+    documents: t.Iterable[tuple[str, tuple[t.Any, str | None]]],
+    matchers: t.Callable[[str], PhraseMatcher],
+    language: str | None,
+) -> t.Iterator[str]:
+    """Find phrases in documents stream formatting results as NDJSON."""
+    worker = get_phrase_finder_worker()
+
+    # Process documents in batches if language is known
+    if language is not None:
+        results = worker.match_phrases_stream(documents, matchers(language), language)
+        for found_phrases, (document_id, error) in results:
+            if error:
+                yield format_result(document_id, error=error, status=400)
+            else:
+                yield format_result(document_id, found_phrases=found_phrases)
+        return
+
+    # Process documents one by one detecting their language
+    for text, (document_id, error) in documents:
+        if error:
+            yield format_result(document_id, error=error, status=400)
+            continue
+
+        try:
+            text_language = worker.detect_language(text)
+            found_phrases = worker.match_phrases(
+                text, matchers(text_language), text_language
+            )
+        except UnknownLanguageError as exc:
+            yield format_result(document_id, error=str(exc), status=406)
+            continue
+        except (LanguageNotReadyError, NLPPoolUnavailableError) as exc:
+            yield format_result(document_id, error=str(exc), status=503)
+            continue
+
+        yield format_result(document_id, found_phrases=found_phrases)
+
+
+@PHRASE_SETS_LATENCY.time()
+@login_required
+@scope_required("phrase_finder")
+def phrase_sets() -> tuple[dict[str, str | int], int, ...]:
+    """Register phrase set.
+    ---
+    Body (JSON):
+        - phrases: Phrases to be found.
+        - language [Optional]: Phrases language.
+
+    Responses:
+        200:
+            description: Return registered phrase set id.
+            schema:
+                phrase_set: 1
+                status: 200
+        400:
+            description: Json body or ['phrases'] key not found in request body
+                OR ['phrases'] is not a list of strings OR ['language'] is not a string.
+            schema:
+                error: Error description.
+                status: 400
+        406:
+            description: No phrases given OR Unknown language.
+            schema:
+                error: Error description.
+                status: 406
+        503:
+            description: Language model is warming up.
+            schema:
+                error: Error description.
+                status: 503
+    """
+
+    # Check input body
+    check = check_request_keys({"phrases"})
+    if check:
+        return check
+
+    phrases = request.json["phrases"]
+    if isinstance(phrases, str):
+        phrases = [phrases]
+    language = request.json.get("language")
+    check = check_string_lists(phrases=phrases) or check_optional_strings(
+        language=language
+    )
+    if check:
+        return check
+    phrases = [p for p in phrases if p != ""]
+    if not phrases:
+        response = {"error": "No phrases given. Try again please.", "status": 406}
+        return response, 406
+
+    # Register phrase set
+    try:
+        phrase_set = get_phrase_set_registry().register(
+            phrases, language, current_user.id
+        )
+    except UnknownLanguageError as exc:
+        response = {"error": str(exc), "status": 406}
+        return response, 406
+    except LanguageNotReadyError as exc:
+        return _not_ready_response(exc)
+
+    response = {"phrase_set": phrase_set.id, "status": 200}
+    return response, 200
+
+
+def _not_ready_response(
+    exc: LanguageNotReadyError,
+) -> tuple[dict[str, str | int], int, dict[str, str]]:
+    """Respond that language model is still loading."""
+    response = {"error": str(exc), "status": 503}
+    return response, 503, {"Retry-After": "30"}
+
+
+def _unavailable_response(
+    exc: NLPPoolUnavailableError,
+) -> tuple[dict[str, str | int], int, dict[str, str]]:
+    """Respond that NLP pool processing texts is not available."""
+    logger.error(f"NLP pool is unavailable: {exc.__cause__}")
+    response = {"error": str(exc), "status": 503}
+    return response, 503, {"Retry-After": "30"}
+
+
+def _check_phrase_set_id(
+    phrase_set_id: t.Any,
+) -> tuple[dict[str, str | int], int] or bool:
+    """Check phrase set id from request json body is an integer or its string."""
+    if isinstance(phrase_set_id, (bool, list, dict, float)):
+        response = {"error": "['phrase_set'] must be an integer.", "status": 400}
+        return response, 400
+
+    return False
+
+
+def _parse_phrase_set_id(phrase_set_id: str | int) -> int:
+    """Convert phrase set id from request to database id."""
+    try:
+        return int(phrase_set_id)
+    except (TypeError, ValueError) as exc:
+        raise UnknownPhraseSetError(phrase_set_id) from exc
+
+
+@click.command("build-lemma-cache")
+@click.option(
+    "--output",
+    default=config.PHRASE_FINDER_LEMMA_CACHE_PATH,
+    help="Cache file path. Defaults to BELINSKY_PHRASE_FINDER_LEMMA_CACHE_PATH.",
+)
+@click.option(
+    "--language",
+    "languages",
+    multiple=True,
+    help="Language of phrases files and phrase sets without language. Can be repeated.",
+)
+@click.argument("phrases_files", nargs=-1, type=click.File(encoding="utf-8"))
+@with_appcontext
+def build_lemma_cache(
+    output: str | None, languages: tuple[str, ...], phrases_files: tuple[t.TextIO, ...]
+) -> None:
+    """Precompute lemmas of registered phrase sets and phrases files.
+
+    Phrases files contain a phrase per line.
+    """
+
+    if not output:
+        raise click.UsageError("No cache file path given.")
+    languages = languages or tuple(config.SPACY_PRELOAD_LANGUAGES)
+
+    # Collect phrases by their language
+    phrases: dict[str, list[str]] = {language: [] for language in languages}
+    for phrases_file in phrases_files:
+        file_phrases = [line.rstrip("\r\n") for line in phrases_file]
+        for language in languages:
+            phrases[language] += filter(None, file_phrases)
+    for phrase_set in database.get_all(models.PhraseSet):
+        for language in [phrase_set.language] if phrase_set.language else languages:
+            phrases.setdefault(language, []).extend(phrase_set.phrases)
+
+    # Models of the web worker are reused unless they live in NLP pool
+    worker = get_phrase_finder_worker() if nlp_pool is None else create_phrase_finder()
+    number = worker.build_lemma_cache(output, phrases)
+    click.echo(f"Cached lemmas of {number} phrases in {output}.")
+
+
 def create_blueprint_phrase_finder() -> Blueprint:
     """Create PhraseFinder blueprint."""
     # Create Flask blueprint
@@ -88,9 +617,36 @@ def create_blueprint_phrase_finder() -> Blueprint:
     phrase_finder_bp.add_url_rule(
         "/phrase-finder", view_func=phrase_finder, methods=["GET", "POST"]
     )
+    phrase_finder_bp.add_url_rule(
+        "/phrase-finder/batch", view_func=phrase_finder_batch, methods=["POST"]
+    )
+    phrase_finder_bp.add_url_rule(
+        "/phrase-finder/stream", view_func=phrase_finder_stream, methods=["POST"]
+    )
+    phrase_finder_bp.add_url_rule(
+        "/phrase-sets", view_func=phrase_sets, methods=["POST"]
+    )
+
+    # Respond with 503 when NLP pool is down
+    phrase_finder_bp.register_error_handler(
+        NLPPoolUnavailableError, _unavailable_response
+    )
+
+    # Add offline commands
+    phrase_finder_bp.cli.add_command(build_lemma_cache)
 
     logger.debug("Created Phrase Finder blueprint.")
     return phrase_finder_bp
 
 
-__all__ = ["create_blueprint_phrase_finder", "PhraseFinder"]
+__all__ = [
+    "create_blueprint_phrase_finder",
+    "get_phrase_finder_worker",
+    "get_phrase_set_registry",
+    "on_starting",
+    "on_exit",
+    "warmup",
+    "BasePhraseFinder",
+    "PhraseFinder",
+    "PhraseSetRegistry",
+]
@@ -1,4 +1,33 @@
 """Format Phrase Analyzer outputs."""
+import heapq
+import typing as t
+
+
+def _merge_spans(spans: t.Iterable[list[list[int]]]) -> t.Iterator[tuple[int, int]]:
+    """Merge overlapping spans of sorted spans lists.
+
+    Args:
+        spans (t.Iterable): Lists of [start, end] spans sorted by start,
+            ends are inclusive.
+
+    Yields:
+        tuple:
+            Disjoint (start, end) spans in text order, ends are exclusive.
+    """
+
+    merged = heapq.merge(*spans)
+    first = next(merged, None)
+    if first is None:
+        return
+
+    start, end = first[0], first[1] + 1
+    for next_start, next_end in merged:
+        if next_start > end:
+            yield start, end
+            start, end = next_start, next_end + 1
+        else:
+            end = max(end, next_end + 1)
+    yield start, end
 
 
 def bold_phrases(
@@ -6,9 +35,11 @@ def bold_phrases(
 ) -> str:
     """Highlight found phrases using <br> html tags.
 
+    Overlapping phrases are highlighted as a single span.
+
     Args:
         text (str): Original text.
-        phrases (list[list[int]]): Found phrases.
+        phrases (dict[str, list[list[int]]]): Found phrases spans sorted by start.
         tag (str): Tag to be added on found phrases.
 
     Returns:
@@ -16,19 +47,12 @@ def bold_phrases(
             Formatted text
     """
 
-    formatted_text = ""
+    closing_tag = tag[0] + "/" + tag[1:]
+    formatted_text = []
     old_end = 0
-    phrases = sum(phrases.values(), [])
-    phrases.sort(key=lambda x: x[0])
-    for start, end in phrases:
-        end += 1
-        formatted_text += text[old_end:start]
-        formatted_text += tag
-        formatted_text += text[start:end]
-        formatted_text += tag[0] + "/" + tag[1:]
+    for start, end in _merge_spans(phrases.values()):
+        formatted_text += (text[old_end:start], tag, text[start:end], closing_tag)
         old_end = end
-    formatted_text += text[old_end:]
-
-    formatted_text = "<br>".join(formatted_text.split("\r\n"))
+    formatted_text.append(text[old_end:])
 
-    return formatted_text
+    return "".join(formatted_text).replace("\r\n", "<br>")
@@ -0,0 +1,213 @@
+"""Belinsky PhraseFinder language detector."""
+import functools
+import hashlib
+import importlib.util
+import math
+import re
+import runpy
+import sys
+import typing as t
+import unicodedata
+from collections import Counter
+from pathlib import Path
+
+from ..utils import LRUCache
+
+_WORD = re.compile(r"[^\W\d_]+")
+
+# Additive smoothing of trigram counts. Profiles are sparse,
+# so unseen trigrams have to cost much more than rarely seen ones.
+_SMOOTHING = 0.03
+
+# Log prior probability of languages not expected by the detector.
+# Short texts are assigned to expected languages unless evidence is strong.
+_UNEXPECTED_LOG_PRIOR = math.log(1e-12)
+
+# Minimum number of trigrams and confidence to detect languages not expected
+# by the detector. Single words of expected languages often look like words
+# of related ones, so short or ambiguous texts fall back to default language.
+_UNEXPECTED_MIN_TRIGRAMS = 16
+_UNEXPECTED_MIN_CONFIDENCE = 0.05
+
+
+@functools.lru_cache(maxsize=None)
+def _get_script(char: str) -> str | None:
+    """Get unicode script of letter."""
+    if not char.isalpha():
+        return None
+
+    script = unicodedata.name(char, "").split(" ")[0]
+    return "KANA" if script in ("HIRAGANA", "KATAKANA") else script
+
+
+def _count_scripts(text: str) -> Counter:
+    """Count letters of every unicode script in text."""
+    scripts = Counter(filter(None, map(_get_script, text)))
+
+    # Japanese texts mix kana with Chinese characters
+    if scripts.get("KANA") and "CJK" in scripts:
+        scripts["KANA"] += scripts.pop("CJK")
+
+    return scripts
+
+
+def _get_trigrams(text: str) -> t.Iterator[str]:
+    """Split text words into character trigrams."""
+    for word in _WORD.findall(text.lower()):
+        word = f" {word} "
+        for index in range(len(word) - 2):
+            yield word[index : index + 3]
+
+
+def _get_spacy_languages_dir() -> Path:
+    """Get directory of spaCy languages packages without importing spaCy."""
+    return Path(importlib.util.find_spec("spacy").submodule_search_locations[0], "lang")
+
+
+def _load_language_sample(language_dir: Path) -> str | None:
+    """Load spaCy stop words and example sentences of language.
+
+    Modules are run from their files, as importing language packages
+    builds their tokenizer exceptions, which takes seconds for some languages.
+    """
+    if not (language_dir / "stop_words.py").is_file():
+        return None
+
+    stop_words = runpy.run_path(str(language_dir / "stop_words.py"))["STOP_WORDS"]
+    sample = " ".join(sorted(stop_words))
+
+    if (language_dir / "examples.py").is_file():
+        examples = runpy.run_path(str(language_dir / "examples.py"))["sentences"]
+        sample += " " + " ".join(examples)
+
+    return sample
+
+
+# pylint: disable=too-few-public-methods
+class LanguageDetector:
+    """Character trigram language detector.
+
+    Detects language of a bounded text sample without running spaCy pipelines.
+    Candidate languages are chosen by the text script and scored with trigram
+    profiles built from stop words and example sentences shipped with spaCy.
+    """
+
+    def __init__(
+        self,
+        expected_languages: t.Iterable[str],
+        sample_size: int = 1024,
+        cache_max_entries: int = 100_000,
+        default_language: str = "en",
+    ):
+        """Initialize the LanguageDetector.
+
+        Args:
+            expected_languages (t.Iterable): Languages texts are expected in.
+                Other spaCy languages are detected only by strong evidence.
+            sample_size (int): Number of first text characters to be analyzed.
+            cache_max_entries (int): Maximum number of cached detection results.
+            default_language (str): Language of texts without known letters
+                and of short or ambiguous texts of unexpected languages.
+        """
+
+        self.expected_languages = set(expected_languages)
+        self.sample_size = sample_size
+        self.default_language = default_language
+
+        # Results are tiny, so cache is bounded by entries only
+        self.cache = LRUCache("language_detector", cache_max_entries, sys.maxsize)
+
+        # Build trigram profiles of spaCy languages
+        profiles: dict[str, Counter] = {}
+        self._scripts: dict[str, list[str]] = {}
+        for language_dir in sorted(_get_spacy_languages_dir().iterdir()):
+            sample = _load_language_sample(language_dir)
+            if sample:
+                profiles[language_dir.name] = Counter(_get_trigrams(sample))
+                script = _count_scripts(sample).most_common(1)[0][0]
+                self._scripts.setdefault(script, []).append(language_dir.name)
+        vocabulary_size = len(set().union(*profiles.values()))
+
+        self._log_probs: dict[str, tuple[dict[str, float], float]] = {}
+        for language, profile in profiles.items():
+            total = math.log(sum(profile.values()) + _SMOOTHING * vocabulary_size)
+            self._log_probs[language] = (
+                {
+                    trigram: math.log(count + _SMOOTHING) - total
+                    for trigram, count in profile.items()
+                },
+                math.log(_SMOOTHING) - total,
+            )
+
+    def detect(self, text: str) -> tuple[str, float]:
+        """Detect text language.
+
+        Args:
+            text (str): Text to be processed.
+
+        Returns:
+            tuple:
+                Language code as https://en.wikipedia.org/wiki/List_of_ISO_639-1_codes
+                and detection confidence from 0 to 1.
+        """
+
+        sample = text[: self.sample_size]
+        key = hashlib.blake2b(sample.encode(), digest_size=16).digest()
+
+        result = self.cache.get(key)
+        if result is None:
+            result = self._detect(sample)
+            self.cache.set(key, result)
+
+        return result
+
+    def _detect(self, sample: str) -> tuple[str, float]:
+        # Choose candidate languages by the most used script
+        scripts = _count_scripts(sample)
+        if not scripts:
+            return self.default_language, 0.0
+
+        script, letters = scripts.most_common(1)[0]
+        candidates = self._scripts.get(script)
+        if not candidates:
+            return self.default_language, 0.0
+
+        confidence = letters / sum(scripts.values())
+        if len(candidates) == 1:
+            return candidates[0], confidence
+
+        # Score candidates by average trigram log probability,
+        # so confidence doesn't depend on text length
+        trigrams = Counter(_get_trigrams(sample))
+        number = sum(trigrams.values())
+        if number < _UNEXPECTED_MIN_TRIGRAMS:
+            candidates = [
+                language
+                for language in candidates
+                if language in self.expected_languages
+            ]
+            if not candidates:
+                return self.default_language, 0.0
+
+        scores = {}
+        for language in candidates:
+            log_probs, unseen = self._log_probs[language]
+            score = sum(
+                count * log_probs.get(trigram, unseen)
+                for trigram, count in trigrams.items()
+            )
+            if language not in self.expected_languages:
+                score += _UNEXPECTED_LOG_PRIOR
+            scores[language] = score / number
+
+        language = max(scores, key=scores.get)
+        normalizer = sum(
+            math.exp(score - scores[language]) for score in scores.values()
+        )
+        confidence /= normalizer
+        if (
+            language not in self.expected_languages
+            and confidence < _UNEXPECTED_MIN_CONFIDENCE
+        ):
+            return self.default_language, 0.0
+        return language, confidence
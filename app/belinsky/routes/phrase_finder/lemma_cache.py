@@ -0,0 +1,145 @@
+"""Belinsky PhraseFinder on-disk lemma cache."""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import typing as t
+
+import numpy as np
+
+_MAGIC = b"BLMC"
+_FORMAT_VERSION = 1
+
+# Magic, format version and JSON header length
+_PREFIX = struct.Struct("<4sII")
+
+# Arrays are stored little-endian aligned to 8 bytes
+_DTYPE = np.dtype("<u8")
+
+
+def _key(language: str, phrase: str) -> int:
+    """Hash language and phrase into a 64-bit key."""
+    digest = hashlib.blake2b(f"{language}\0{phrase}".encode(), digest_size=8)
+    return int.from_bytes(digest.digest(), "little")
+
+
+class LemmaCache:
+    """Read-only memory-mapped cache of phrases lemmas hashes.
+
+    The file stores sorted 64-bit keys of (language, phrase), offsets of every
+    phrase lemmas and lemmas hashes as flat arrays looked up by binary search.
+    Mapped pages are shared by all processes reading the file, so gunicorn
+    workers don't duplicate the cache in memory.
+    """
+
+    def __init__(self, path: str):
+        """Initialize the LemmaCache.
+
+        Args:
+            path (str): Cache file built by LemmaCache.write.
+        """
+
+        self.path = path
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, header_length = _PREFIX.unpack_from(self._mmap)
+        if magic != _MAGIC or version != _FORMAT_VERSION:
+            raise ValueError(
+                f"{path} is not a lemma cache of version {_FORMAT_VERSION}."
+            )
+        header = json.loads(self._mmap[_PREFIX.size : _PREFIX.size + header_length])
+
+        self.models: dict[str, str] = header["models"]
+        entries, lemmas = header["entries"], header["lemmas"]
+
+        offset = _align(_PREFIX.size + header_length)
+        self._keys = np.frombuffer(self._mmap, _DTYPE, entries, offset)
+        offset += self._keys.nbytes
+        self._offsets = np.frombuffer(self._mmap, _DTYPE, entries + 1, offset)
+        offset += self._offsets.nbytes
+        self._lemma_hashes = np.frombuffer(self._mmap, _DTYPE, lemmas, offset)
+
+    def __len__(self) -> int:
+        """Return number of cached phrases."""
+        return len(self._keys)
+
+    def get_many(self, language: str, phrases: list[str]) -> list[np.ndarray | None]:
+        """Get phrases lemmas hashes.
+
+        Args:
+            language (str): Phrases language.
+            phrases (list): Phrases to be looked up.
+
+        Returns:
+            list:
+                Lemmas hashes of every phrase or None if phrase is not cached.
+        """
+
+        if not phrases or len(self) == 0:
+            return [None] * len(phrases)
+
+        keys = np.fromiter(
+            (_key(language, phrase) for phrase in phrases), _DTYPE, len(phrases)
+        )
+        indexes = np.minimum(np.searchsorted(self._keys, keys), len(self) - 1)
+        found = self._keys[indexes] == keys
+        starts = self._offsets[indexes].tolist()
+        ends = self._offsets[indexes + 1].tolist()
+
+        return [
+            self._lemma_hashes[start:end] if is_found else None
+            for start, end, is_found in zip(starts, ends, found.tolist())
+        ]
+
+    @staticmethod
+    def write(
+        path: str,
+        models: dict[str, str],
+        entries: t.Iterable[tuple[str, str, np.ndarray]],
+    ) -> int:
+        """Write lemma cache file.
+
+        The file is replaced atomically, so running processes keep reading
+        the old file until they open the new one.
+
+        Args:
+            path (str): Cache file path.
+            models (dict): Fingerprints of models used for every language.
+            entries (t.Iterable): Languages, phrases and their lemmas hashes.
+
+        Returns:
+            int:
+                Number of cached phrases.
+        """
+
+        lemmas_by_key = {
+            _key(language, phrase): lemma_hashes
+            for language, phrase, lemma_hashes in entries
+        }
+        keys = sorted(lemmas_by_key)
+        lengths = [len(lemmas_by_key[key]) for key in keys]
+        offsets = np.zeros(len(keys) + 1, dtype=_DTYPE)
+        offsets[1:] = np.cumsum(lengths)
+
+        header = json.dumps(
+            {"models": models, "entries": len(keys), "lemmas": int(offsets[-1])}
+        ).encode()
+        prefix = _PREFIX.pack(_MAGIC, _FORMAT_VERSION, len(header)) + header
+
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(prefix.ljust(_align(len(prefix)), b"\0"))
+            file.write(np.array(keys, dtype=_DTYPE).tobytes())
+            file.write(offsets.tobytes())
+            for key in keys:
+                file.write(np.asarray(lemmas_by_key[key], dtype=_DTYPE).tobytes())
+        os.replace(temporary_path, path)
+
+        return len(keys)
+
+
+def _align(offset: int) -> int:
+    """Round offset up to arrays alignment."""
+    return -(-offset // _DTYPE.itemsize) * _DTYPE.itemsize
@@ -0,0 +1,117 @@
+"""Belinsky PhraseFinder multi-phrase matcher."""
+import sys
+import typing as t
+from collections import deque
+
+import numpy as np
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton over lemma sequences.
+
+    Finds every compiled phrase in a single pass over the text lemmas, so the
+    matching cost doesn't depend on the number of phrases. Lemmas are expected
+    as arrays of spaCy uint64 hashes, so text lemmas not found in any phrase
+    are skipped with one vectorized lookup.
+    """
+
+    def __init__(self, phrases: t.Mapping[str, t.Sequence[t.Hashable]]):
+        """Compile phrases into the automaton.
+
+        Args:
+            phrases (t.Mapping): Phrases and their lemma sequences.
+        """
+
+        self.phrases = list(phrases)
+        phrases = {phrase: np.asarray(lemmas) for phrase, lemmas in phrases.items()}
+
+        # Collect lemmas found in phrases
+        alphabets = [lemmas for lemmas in phrases.values() if lemmas.size]
+        self._alphabet = np.unique(np.concatenate(alphabets)) if alphabets else None
+
+        # Build trie of lemma sequences
+        self._goto: list[dict[t.Hashable, int]] = [{}]
+        self._outputs: list[list[tuple[int, int]]] = [[]]
+        for phrase_id, lemmas in enumerate(phrases.values()):
+            if not lemmas.size:
+                continue
+
+            state = 0
+            for lemma in lemmas.tolist():
+                if lemma not in self._goto[state]:
+                    self._goto.append({})
+                    self._outputs.append([])
+                    self._goto[state][lemma] = len(self._goto) - 1
+                state = self._goto[state][lemma]
+            self._outputs[state].append((phrase_id, len(lemmas)))
+
+        # Build failure links in breadth-first order
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for lemma, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fail = self._fail[state]
+                while fail and lemma not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(lemma, 0) if state else 0
+
+                self._fail[next_state] = fail
+                self._outputs[next_state] = (
+                    self._outputs[next_state] + self._outputs[fail]
+                )
+
+    def __len__(self) -> int:
+        """Return number of compiled phrases."""
+        return len(self.phrases)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate size of the automaton in bytes."""
+        return (
+            sys.getsizeof(self.phrases)
+            + sum(map(sys.getsizeof, self.phrases))
+            + sum(map(sys.getsizeof, self._goto))
+            + sum(map(sys.getsizeof, self._outputs))
+            + sys.getsizeof(self._fail)
+            + (self._alphabet.nbytes if self._alphabet is not None else 0)
+        )
+
+    def find(self, lemmas: np.ndarray) -> list[list[tuple[int, int]]]:
+        """Find compiled phrases in lemmas sequence.
+
+        Args:
+            lemmas (np.ndarray): Lemmatized text.
+
+        Returns:
+            list:
+                Start and end lemma indexes of every match per phrase,
+                in the order phrases were compiled.
+        """
+
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        result = [[] for _ in self.phrases]
+
+        lemmas = np.asarray(lemmas)
+        if self._alphabet is None or not lemmas.size:
+            return result
+
+        # Run automaton only over lemmas found in phrases,
+        # resetting it after other lemmas as matches can't cross them
+        hits = np.flatnonzero(np.isin(lemmas, self._alphabet))
+        state, previous = 0, -1
+        for index, lemma in zip(hits.tolist(), lemmas[hits].tolist()):
+            if index != previous + 1:
+                state = 0
+            previous = index
+
+            while state and lemma not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(lemma, 0)
+
+            for phrase_id, length in outputs[state]:
+                result[phrase_id].append((index - length + 1, index))
+
+        return result
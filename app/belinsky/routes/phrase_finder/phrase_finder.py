@@ -1,13 +1,55 @@
 """Belinsky PhraseFinder nlp worker."""
+import abc
+import hashlib
+import json
+import operator
+import re
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from dataclasses import dataclass
+from pathlib import Path
 import typing as t
 
+import numpy as np
 import spacy
-from spacy_langdetect import LanguageDetector
-
-from ..utils import UnknownLanguageError
+from loguru import logger
+
+from .language_detector import LanguageDetector
+from .lemma_cache import LemmaCache
+from .matcher import PhraseMatcher
+from ..utils import LanguageNotReadyError, LRUCache, RedisCache, UnknownLanguageError
+
+PIPELINE_PROFILES = ("full", "minimal", "lookup")
+
+# Token attributes exported from spaCy docs. Tokens with any of
+# the first six attributes set are skipped.
+_TOKEN_ATTRS = [
+    "IS_PUNCT",
+    "IS_LEFT_PUNCT",
+    "IS_RIGHT_PUNCT",
+    "IS_SPACE",
+    "IS_QUOTE",
+    "IS_BRACKET",
+    "LEMMA",
+    "IDX",
+    "LENGTH",
+]
+
+# Pipeline components required by spaCy lemmatizer modes.
+# Rule-based modes need part of speech from tagger with attribute ruler
+# or from morphologizer, lookup modes need only tokens.
+_LEMMATIZER_REQUIREMENTS = {
+    "lookup": (),
+    "pymorphy2_lookup": (),
+    "pymorphy3_lookup": (),
+    "rule": ("tok2vec", "tagger", "attribute_ruler", "morphologizer"),
+    "pos_lookup": ("tok2vec", "tagger", "attribute_ruler", "morphologizer"),
+    "pymorphy2": ("tok2vec", "morphologizer", "attribute_ruler"),
+    "pymorphy3": ("tok2vec", "morphologizer", "attribute_ruler"),
+}
 
 
 @dataclass(slots=True, frozen=True)
@@ -17,48 +59,157 @@ class Token:
     word: str
     lemma: str
     position: t.Sequence[int]
+    lemma_hash: int = 0
 
     def to_list(self):
         """Convert token structure to list of values."""
         return self.word, self.lemma, self.position
 
 
-class PhraseFinder:
-    """Belinsky PhraseFinder nlp worker."""
+class Tokens(t.Sequence[Token]):
+    """Columnar storage of text tokens.
 
-    def __init__(self):
-        """Initialize the PhraseFinder."""
+    Keeps tokens offsets and lemmas hashes in arrays, words and Token structures
+    are created from the text only when accessed.
+    """
 
-        # Initialize spaCy
-        base_spacy_languages = {"en": "en_core_web_sm", "ru": "ru_core_news_sm"}
-        self.known_spacy_languages = {
-            "da": "da_core_news_sm",
-            "de": "de_core_news_sm",
-            "el": "el_core_news_sm",
-            "es": "es_core_news_sm",
-            "fr": "fr_core_news_sm",
-            "it": "it_core_news_sm",
-            "ja": "ja_core_news_sm",
-            "nl": "nl_core_news_sm",
-            "pl": "pl_core_news_sm",
-            "pt": "pt_core_news_sm",
-            "ro": "ro_core_news_sm",
-            "zh": "zh_core_web_sm",
-        }
+    def __init__(
+        self,
+        text: str,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        lemma_hashes: np.ndarray,
+        lemmas: dict[int, str],
+    ):
+        """Initialize the Tokens.
 
-        self.lemmatizers = {
-            lang: spacy.load(model_name, disable=["parser", "ner"])
-            for lang, model_name in base_spacy_languages.items()
-        }
+        Args:
+            text (str): Tokenized text.
+            starts (np.ndarray): Tokens first characters indexes.
+            ends (np.ndarray): Tokens last characters indexes.
+            lemma_hashes (np.ndarray): Tokens lemmas hashes.
+            lemmas (dict): Lemmas by their hashes.
+        """
+
+        self.text = text
+        self.starts = starts
+        self.ends = ends
+        self.lemma_hashes = lemma_hashes
+        self._lemmas = lemmas
+
+    def __len__(self) -> int:
+        """Return number of tokens."""
+        return len(self.lemma_hashes)
+
+    def __getitem__(self, index: int | slice) -> "Token | Tokens":
+        """Create token structure by its index or tokens view by slice."""
+        if isinstance(index, slice):
+            return Tokens(
+                self.text,
+                self.starts[index],
+                self.ends[index],
+                self.lemma_hashes[index],
+                self._lemmas,
+            )
 
-        # Initialize spaCy language detector
-        spacy.Language.factory(
-            "language_detector", func=lambda nlp, name: LanguageDetector()
+        index = range(len(self))[index]
+        start, end = int(self.starts[index]), int(self.ends[index])
+        lemma_hash = int(self.lemma_hashes[index])
+        return Token(
+            self.text[start : end + 1],
+            self._lemmas[lemma_hash],
+            (start, end),
+            lemma_hash,
         )
-        self._get_lemmatizer("en").add_pipe("sentencizer")
-        self._get_lemmatizer("en").add_pipe("language_detector", last=True)
 
-    # noinspection PyProtectedMember
+    def __iter__(self) -> t.Iterator[Token]:
+        """Iterate over token structures."""
+        for start, end, lemma_hash in zip(
+            self.starts.tolist(), self.ends.tolist(), self.lemma_hashes.tolist()
+        ):
+            yield Token(
+                self.text[start : end + 1],
+                self._lemmas[lemma_hash],
+                (start, end),
+                lemma_hash,
+            )
+
+    @property
+    def words(self) -> list[str]:
+        """Get tokens words."""
+        return [
+            self.text[start : end + 1]
+            for start, end in zip(self.starts.tolist(), self.ends.tolist())
+        ]
+
+    @property
+    def lemmas(self) -> list[str]:
+        """Get tokens lemmas."""
+        return [self._lemmas[lemma_hash] for lemma_hash in self.lemma_hashes.tolist()]
+
+    @property
+    def nbytes(self) -> int:
+        """Estimate tokens size in bytes."""
+        return (
+            sys.getsizeof(self.text)
+            + self.starts.nbytes
+            + self.ends.nbytes
+            + self.lemma_hashes.nbytes
+            + sys.getsizeof(self._lemmas)
+            + sum(map(sys.getsizeof, self._lemmas.values()))
+        )
+
+
+# Part of word up to its last hyphen and the rest of word
+_HYPHENED_PREFIX = re.compile(r"(?<!\S)(\S*-)(?=(\S*))")
+_WHITESPACE = re.compile(r"\s")
+
+# Number of characters substituted at once. Substitution keeps a piece
+# per match, so large texts are substituted in chunks ending at whitespace.
+_CHUNK_SIZE = 1 << 16
+
+
+def _blank_hyphened_prefix(match: re.Match) -> str:
+    """Replace hyphened word prefix with spaces unless word is all hyphens."""
+    prefix, rest = match.groups()
+    if not rest and not prefix.strip("-"):
+        return prefix
+
+    return " " * len(prefix)
+
+
+def _blank_hyphened_prefixes(text: str) -> str:
+    """Replace hyphened words prefixes with spaces keeping offsets."""
+    chunks = []
+    start = 0
+    while start < len(text):
+        whitespace = _WHITESPACE.search(text, start + _CHUNK_SIZE)
+        end = whitespace.start() if whitespace else len(text)
+        chunks.append(_HYPHENED_PREFIX.sub(_blank_hyphened_prefix, text[start:end]))
+        start = end
+
+    return "".join(chunks)
+
+
+class BasePhraseFinder(abc.ABC):
+    """Belinsky PhraseFinder finding phrases in texts processed by subclasses."""
+
+    def __init__(
+        self,
+        batch_size: int = 256,
+        result_cache: LRUCache | RedisCache | None = None,
+    ):
+        """Initialize the BasePhraseFinder.
+
+        Args:
+            batch_size (int): Number of texts processed in one batch.
+            result_cache (LRUCache | RedisCache): Cache of find_phrases results.
+        """
+
+        self.batch_size = batch_size
+        self.result_cache = result_cache
+
+    @abc.abstractmethod
     def detect_language(self, text: str) -> str:
         """Detect text language
 
@@ -70,9 +221,30 @@ class PhraseFinder:
                 Language code as https://en.wikipedia.org/wiki/List_of_ISO_639-1_codes.
         """
 
-        tokens = self._get_lemmatizer("en")(text)
-        language = tokens._.language["language"]
-        return language
+    def detect_languages(self, texts: list[str]) -> list[str]:
+        """Detect languages of texts.
+
+        Args:
+            texts (list): Texts to be processed.
+
+        Returns:
+            list:
+                Language code of every text.
+        """
+
+        return [self.detect_language(text) for text in texts]
+
+    @abc.abstractmethod
+    def load_language(self, language: str) -> Future:
+        """Start loading language model in background.
+
+        Arguments:
+            language (str): Language.
+
+        Returns:
+            Future:
+                Loading language model.
+        """
 
     def lemmatize(self, text: str, language: str) -> list[str]:
         """Lemmatize text.
@@ -87,11 +259,27 @@ class PhraseFinder:
         """
 
         tokens = self._process_text(text, language)
-        lemmatized = [token.lemma_ for token in tokens]
+        lemmatized = tokens.lemmas
+
+        return lemmatized
+
+    def lemmatize_many(self, texts: t.Iterable[str], language: str) -> list[list[str]]:
+        """Lemmatize texts in batches.
+
+        Arguments:
+             texts (t.Iterable): Texts to be lemmatized.
+             language (str): Language.
+
+        Returns:
+            list:
+                Lemmatized texts.
+        """
+
+        lemmatized = [tokens.lemmas for tokens in self._process_texts(texts, language)]
 
         return lemmatized
 
-    def tokenize(self, text: str, language: str) -> list[Token]:
+    def tokenize(self, text: str, language: str) -> Tokens:
         """Tokenize text.
 
         Arguments:
@@ -99,17 +287,11 @@ class PhraseFinder:
             language (str): Language.
 
         Returns:
-            List:
-                Words' tokens as 'phrase_comparer.Token' structure.
+            Tokens:
+                Words' tokens, iterated as 'phrase_finder.Token' structures.
         """
 
-        tokens = self._process_text(text, language)
-        tokenized = [
-            Token(
-                token.text, token.lemma_, (token.idx, token.idx + len(token.text) - 1)
-            )
-            for token in tokens
-        ]
+        tokenized = self._process_text(text, language)
 
         return tokenized
 
@@ -131,113 +313,619 @@ class PhraseFinder:
         # Check input data
         if isinstance(phrases, str):
             phrases = [phrases]
+        phrases = list(dict.fromkeys(phrases))
+
+        # Respond with cached result skipping language detection and spaCy
+        if self.result_cache is not None:
+            key = self._result_key(text, phrases, lang)
+            result = self.result_cache.get(key)
+            if result is not None:
+                return {phrase: result[phrase] for phrase in phrases}
 
         # Detect language
         if lang is None:
             lang = self.detect_language(text)
 
         # Find phrases
-        tokenized = self.tokenize(text, lang)
-        lemmatized_text = [x.lemma for x in tokenized]
-
-        result = {key: [] for key in phrases}
-        for phrase in phrases:
-            lemmatized_phrase = self.lemmatize(phrase, lang)
-            index_delta = len(lemmatized_phrase) - 1
-            for index in self._find_sublist_indexes(lemmatized_phrase, lemmatized_text):
-                position = [
-                    tokenized[index].position[0],
-                    tokenized[index + index_delta].position[1],
-                ]
-                result[phrase].append(position)
+        matcher = self.compile_phrases(phrases, lang)
+        result = self.match_phrases(text, matcher, lang)
+
+        if self.result_cache is not None:
+            self.result_cache.set(key, result)
 
         return result
 
-    def _process_text(self, text: str, language: str) -> list:
-        # Preprocess russian text
-        if language == "ru":
-            # Split hyphened words
-            processed_text = []
-            for word in text.split(" "):
-                if "-" in word and word != "-" * len(word):
-                    split = word.split("-")
-                    word = " " * len("".join(split[:-1])) + " " + split[-1]
-
-                processed_text.append(word)
-
-            text = " ".join(processed_text)
-
-        # Get tokens from spaCy
-        tokens = self._get_lemmatizer(language)(text)
-
-        # Clean tokens
-        to_check = (
-            "is_punct",
-            "is_left_punct",
-            "is_right_punct",
-            "is_space",
-            "is_quote",
-            "is_bracket",
+    def match_phrases(
+        self, text: str, matcher: PhraseMatcher, lang: str
+    ) -> dict[str, list[list[int]]]:
+        """Find compiled phrases in text.
+
+        Arguments:
+            text (str): Text to be processed.
+            matcher (PhraseMatcher): Compiled phrases.
+            lang (str): Language.
+
+        Returns:
+            Dict:
+                Return phrases and their indexes in text.
+        """
+
+        tokenized = self._process_text(text, lang)
+        return self._get_positions(tokenized, matcher)
+
+    def find_phrases_many(
+        self, texts: t.Iterable[str], phrases: t.Iterable[str], lang: str | None
+    ) -> list[dict[str, list[list[int]]]]:
+        """Find phrases in texts processing them in batches.
+
+        Arguments:
+            texts (t.Iterable): Texts to be processed.
+            phrases (t.Iterable): Phrases to be found.
+            lang (str): Language. If not provided, detected for every text.
+
+        Returns:
+            List:
+                Return phrases and their indexes for every text.
+        """
+
+        # Check input data
+        if isinstance(phrases, str):
+            phrases = [phrases]
+        phrases = list(phrases)
+
+        return self.match_phrases_many(
+            texts, lambda language: self.compile_phrases(phrases, language), lang
         )
-        tokens = [
-            token
-            for token in tokens
-            if all(not getattr(token, attr) for attr in to_check)
-        ]
 
-        return tokens
+    def match_phrases_many(
+        self,
+        texts: t.Iterable[str],
+        get_matcher: t.Callable[[str], PhraseMatcher],
+        lang: str | None,
+    ) -> list[dict[str, list[list[int]]]]:
+        """Find compiled phrases in texts processing them in batches.
 
-    def _get_lemmatizer(self, language: str) -> spacy.Language:
-        """Get lemmatizer for given language."""
-        if language in self.lemmatizers.keys():
-            return self.lemmatizers[language]
+        Arguments:
+            texts (t.Iterable): Texts to be processed.
+            get_matcher (t.Callable): Function returning compiled phrases for language.
+            lang (str): Language. If not provided, detected for every text.
 
-        if language in self.known_spacy_languages:
-            # Load model using PyPi
-            language_model = self.known_spacy_languages[language]
-            link = (
-                "https://github.com/explosion/spacy-models/releases/download/"
-                f"{language_model}-3.3.0/{language_model}-3.3.0.tar.gz"
+        Returns:
+            List:
+                Return phrases and their indexes for every text.
+        """
+
+        texts = list(texts)
+        if lang is None:
+            languages = self.detect_languages(texts)
+        else:
+            languages = [lang] * len(texts)
+
+        # Process texts grouped by language
+        result = [{} for _ in texts]
+        for language in dict.fromkeys(languages):
+            indexes = [
+                i for i, text_lang in enumerate(languages) if text_lang == language
+            ]
+            matcher = get_matcher(language)
+            tokenized = self._process_texts([texts[i] for i in indexes], language)
+            for index, tokens in zip(indexes, tokenized):
+                result[index] = self._get_positions(tokens, matcher)
+
+        return result
+
+    @abc.abstractmethod
+    def match_phrases_stream(
+        self,
+        texts: t.Iterable[tuple[str, t.Any]],
+        matcher: PhraseMatcher,
+        lang: str,
+    ) -> t.Iterator[tuple[dict[str, list[list[int]]], t.Any]]:
+        """Lazily find compiled phrases in a stream of texts.
+
+        Arguments:
+            texts (t.Iterable): Texts to be processed with their contexts.
+            matcher (PhraseMatcher): Compiled phrases.
+            lang (str): Language.
+
+        Yields:
+            Tuple:
+                Phrases and their indexes in text with text context.
+        """
+
+    def compile_phrases(self, phrases: t.Iterable[str], lang: str) -> PhraseMatcher:
+        """Compile phrases into a multi-phrase matcher.
+
+        Arguments:
+            phrases (t.Iterable): Phrases to be found.
+            lang (str): Language.
+
+        Returns:
+            PhraseMatcher:
+                Matcher over phrases' lemmas.
+        """
+
+        phrases = list(dict.fromkeys(phrases))
+        lemmatized_phrases = dict(zip(phrases, self._lemmatize_phrases(phrases, lang)))
+
+        return PhraseMatcher(lemmatized_phrases)
+
+    @abc.abstractmethod
+    def _lemmatize_phrases(self, phrases: list[str], language: str) -> list[np.ndarray]:
+        """Get lemmas hashes of phrases."""
+
+    def _process_text(self, text: str, language: str) -> Tokens:
+        return self._process_texts([text], language)[0]
+
+    @abc.abstractmethod
+    def _process_texts(self, texts: t.Iterable[str], language: str) -> list[Tokens]:
+        """Tokenize and lemmatize texts."""
+
+    @staticmethod
+    def _get_positions(
+        tokenized: Tokens, matcher: PhraseMatcher
+    ) -> dict[str, list[list[int]]]:
+        matches = matcher.find(tokenized.lemma_hashes)
+
+        result = {}
+        for phrase, phrase_matches in zip(matcher.phrases, matches):
+            result[phrase] = [
+                [int(tokenized.starts[start]), int(tokenized.ends[end])]
+                for start, end in phrase_matches
+            ]
+
+        return result
+
+    @staticmethod
+    def _result_key(text: str, phrases: list[str], language: str | None) -> bytes:
+        # Phrases order doesn't change result, so phrases are sorted
+        key = hashlib.blake2b(digest_size=16)
+        key.update(json.dumps([language, sorted(phrases)]).encode())
+        key.update(text.encode())
+        return key.digest()
+
+
+# Worker owns models, their background loading and both caches
+# pylint: disable=too-many-instance-attributes
+class PhraseFinder(BasePhraseFinder):
+    """Belinsky PhraseFinder nlp worker."""
+
+    # pylint: disable=too-many-arguments,too-many-locals
+    def __init__(
+        self,
+        *,
+        batch_size: int = 256,
+        n_process: int = 1,
+        cache_max_entries: int = 100_000,
+        cache_max_bytes: int = 64 * 1024**2,
+        models_dir: str | None = None,
+        download_models: bool = True,
+        model_load_timeout: float = 0,
+        model_retry_interval: float = 60,
+        preload_languages: t.Iterable[str] = ("en", "ru"),
+        language_sample_size: int = 1024,
+        expected_languages: t.Iterable[str] | None = None,
+        pipeline_profile: str = "minimal",
+        result_cache: LRUCache | RedisCache | None = None,
+        lemma_cache_path: str | None = None,
+    ):
+        """Initialize the PhraseFinder.
+
+        Args:
+            batch_size (int): Number of texts to be buffered by spaCy while
+                processing them in batch.
+            n_process (int): Number of processes used by spaCy to process batches.
+            cache_max_entries (int): Maximum number of cached processed texts.
+            cache_max_bytes (int): Maximum size of cached processed texts in bytes.
+            models_dir (str): Directory with spaCy models directories or packages.
+            download_models (bool): Download models not found locally from GitHub.
+            model_load_timeout (float): Seconds to wait for a loading model
+                before responding that language is not ready.
+            model_retry_interval (float): Seconds before loading a model
+                failed to be loaded again.
+            preload_languages (t.Iterable): Languages to be loaded on initialization.
+            language_sample_size (int): Number of first text characters
+                analyzed to detect its language.
+            expected_languages (t.Iterable): Languages texts are expected in.
+                Defaults to preloaded languages.
+            pipeline_profile (str): "minimal" to run only components required
+                by lemmatizer, "full" to run every component except parser and ner,
+                "lookup" to run only lemmatizer in lookup mode needing no tagger.
+            result_cache (LRUCache | RedisCache): Cache of find_phrases results.
+            lemma_cache_path (str): On-disk cache of phrases lemmas
+                built by build_lemma_cache.
+        """
+
+        if pipeline_profile not in PIPELINE_PROFILES:
+            raise ValueError(
+                f"Unknown pipeline profile: {pipeline_profile}. "
+                f"Please use one of: {', '.join(PIPELINE_PROFILES)}."
             )
-            subprocess.check_call(
-                [sys.executable, "-m", "pip", "install", link],
-                stdout=subprocess.DEVNULL,
+
+        super().__init__(batch_size, result_cache)
+        self.n_process = n_process
+        self.cache = LRUCache(
+            "phrase_finder_tokens",
+            cache_max_entries,
+            cache_max_bytes,
+            operator.attrgetter("nbytes"),
+        )
+        self.models_dir = Path(models_dir) if models_dir else None
+        self.download_models = download_models
+        self.model_load_timeout = model_load_timeout
+        self.model_retry_interval = model_retry_interval
+        self.pipeline_profile = pipeline_profile
+        self.lemma_cache = None
+        if lemma_cache_path and Path(lemma_cache_path).exists():
+            self.lemma_cache = LemmaCache(lemma_cache_path)
+            logger.info(
+                f"Loaded {len(self.lemma_cache)} phrases lemmas from {lemma_cache_path}."
             )
+        elif lemma_cache_path:
+            logger.warning(f"Lemma cache {lemma_cache_path} not found.")
+        # Loading models futures and their start time by language
+        self._loading: dict[str, tuple[Future, float]] = {}
+        self._loading_lock = threading.Lock()
+
+        # Initialize spaCy
+        self.known_spacy_languages = {
+            "en": "en_core_web_sm",
+            "ru": "ru_core_news_sm",
+            "da": "da_core_news_sm",
+            "de": "de_core_news_sm",
+            "el": "el_core_news_sm",
+            "es": "es_core_news_sm",
+            "fr": "fr_core_news_sm",
+            "it": "it_core_news_sm",
+            "ja": "ja_core_news_sm",
+            "nl": "nl_core_news_sm",
+            "pl": "pl_core_news_sm",
+            "pt": "pt_core_news_sm",
+            "ro": "ro_core_news_sm",
+            "zh": "zh_core_web_sm",
+        }
+
+        self.lemmatizers = {}
+        for lang in dict.fromkeys(preload_languages):
+            if lang not in self.known_spacy_languages:
+                raise UnknownLanguageError(lang, self.known_spacy_languages.keys())
+            self.lemmatizers[lang] = self._load_model(lang)
+
+        # Initialize language detector
+        self.language_detector = LanguageDetector(
+            self.lemmatizers if expected_languages is None else expected_languages,
+            language_sample_size,
+            cache_max_entries,
+        )
+
+    def detect_language(self, text: str) -> str:
+        """Detect text language
+
+        Args:
+            text (str): Text to be processed.
+
+        Returns:
+            str:
+                Language code as https://en.wikipedia.org/wiki/List_of_ISO_639-1_codes.
+        """
 
-            # Initialize model
-            self.lemmatizers[language] = spacy.load(
-                language_model, disable=["parser", "ner"]
+        language, confidence = self.language_detector.detect(text)
+        logger.debug(
+            f'Detected "{language}" language with {confidence:.2f} confidence.'
+        )
+        return language
+
+    def match_phrases_stream(
+        self,
+        texts: t.Iterable[tuple[str, t.Any]],
+        matcher: PhraseMatcher,
+        lang: str,
+    ) -> t.Iterator[tuple[dict[str, list[list[int]]], t.Any]]:
+        """Lazily find compiled phrases in a stream of texts.
+
+        Texts are read and processed in batches, so memory usage is bounded by
+        the batch size regardless of the stream length.
+
+        Arguments:
+            texts (t.Iterable): Texts to be processed with their contexts.
+            matcher (PhraseMatcher): Compiled phrases.
+            lang (str): Language.
+
+        Yields:
+            Tuple:
+                Phrases and their indexes in text with text context.
+        """
+
+        # Keep preprocessed texts in contexts to build tokens from them
+        texts = (
+            (processed := self._preprocess_text(text, lang), (processed, context))
+            for text, context in texts
+        )
+        docs = self._get_lemmatizer(lang).pipe(
+            texts,
+            as_tuples=True,
+            batch_size=self.batch_size,
+            n_process=self.n_process,
+        )
+        for doc, (text, context) in docs:
+            yield self._get_positions(self._doc_to_tokens(doc, text), matcher), context
+
+    def build_lemma_cache(self, path: str, phrases: dict[str, t.Iterable[str]]) -> int:
+        """Build on-disk cache of phrases lemmas.
+
+        Arguments:
+            path (str): Cache file path.
+            phrases (dict): Phrases to be cached by their language.
+
+        Returns:
+            int:
+                Number of cached phrases.
+        """
+
+        models = {}
+        entries = []
+        for language, language_phrases in phrases.items():
+            language_phrases = list(dict.fromkeys(language_phrases))
+            models[language] = self._model_fingerprint(language)
+            tokenized = self._run_pipeline(language_phrases, language)
+            entries += [
+                (language, phrase, tokens.lemma_hashes)
+                for phrase, tokens in zip(language_phrases, tokenized)
+            ]
+
+        return LemmaCache.write(path, models, entries)
+
+    def _lemmatize_phrases(self, phrases: list[str], language: str) -> list[np.ndarray]:
+        # Look phrases up in on-disk cache built with the same model
+        result = [None] * len(phrases)
+        if self.lemma_cache is not None and self.lemma_cache.models.get(
+            language
+        ) == self._model_fingerprint(language):
+            result = self.lemma_cache.get_many(language, phrases)
+
+        # Process not cached phrases
+        missed = [index for index, lemmas in enumerate(result) if lemmas is None]
+        if missed:
+            tokenized = self._process_texts(
+                [phrases[index] for index in missed], language
             )
+            for index, tokens in zip(missed, tokenized):
+                result[index] = tokens.lemma_hashes
 
-            return self.lemmatizers[language]
+        return result
 
-        raise UnknownLanguageError(
-            language, self.lemmatizers.keys() | self.known_spacy_languages.keys()
+    def _model_fingerprint(self, language: str) -> str:
+        # Lemmas depend on model version and components run
+        meta = self._get_lemmatizer(language).meta
+        return (
+            f"{meta['lang']}_{meta['name']}-{meta['version']}:{self.pipeline_profile}"
         )
 
+    def _process_texts(self, texts: t.Iterable[str], language: str) -> list[Tokens]:
+        texts = list(texts)
+        keys = [self._cache_key(text, language) for text in texts]
+        result = [self.cache.get(key) for key in keys]
+
+        # Process not cached texts
+        missed = [index for index, tokens in enumerate(result) if tokens is None]
+        if missed:
+            tokenized = self._run_pipeline([texts[index] for index in missed], language)
+            for index, tokens in zip(missed, tokenized):
+                result[index] = tokens
+                self.cache.set(keys[index], tokens)
+
+        return result
+
+    def _run_pipeline(self, texts: list[str], language: str) -> list[Tokens]:
+        lemmatizer = self._get_lemmatizer(language)
+        texts = [self._preprocess_text(text, language) for text in texts]
+
+        # Process texts in batches if there are many of them
+        if len(texts) == 1:
+            docs = [lemmatizer(texts[0])]
+        else:
+            docs = lemmatizer.pipe(
+                texts, batch_size=self.batch_size, n_process=self.n_process
+            )
+
+        return [self._doc_to_tokens(doc, text) for doc, text in zip(docs, texts)]
+
+    @staticmethod
+    def _cache_key(text: str, language: str) -> tuple[str, bytes]:
+        return language, hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+    @staticmethod
+    def _preprocess_text(text: str, language: str) -> str:
+        # Preprocess russian text
+        if language == "ru" and "-" in text:
+            text = _blank_hyphened_prefixes(text)
+
+        return text
+
     @staticmethod
-    def _find_sublist_indexes(
-        sub: t.Sequence[t.Any], bigger: t.Sequence[t.Any]
-    ) -> list[int]:
-        """Find indexes of sublist first items in list.
+    def _doc_to_tokens(doc: spacy.tokens.Doc, text: str) -> Tokens:
+        # Text is passed as doc.text is rebuilt from tokens on every access
+        # Skip punctuation and spaces in one pass over attributes array
+        array = doc.to_array(_TOKEN_ATTRS)
+        array = array[~array[:, :6].any(axis=1)]
+
+        lemma_hashes = np.ascontiguousarray(array[:, 6])
+        starts = array[:, 7].astype(np.uint32)
+        ends = (starts + array[:, 8] - 1).astype(np.uint32)
+        lemmas = {
+            lemma_hash: doc.vocab.strings[lemma_hash]
+            for lemma_hash in np.unique(lemma_hashes).tolist()
+        }
+
+        return Tokens(text, starts, ends, lemma_hashes, lemmas)
+
+    def load_language(self, language: str) -> Future:
+        """Start loading language model in background.
+
+        Failed load is kept for model_retry_interval seconds, so requests fail
+        fast instead of loading the model again.
 
         Arguments:
-            sub (list): Sublist to find in main list.
-            bigger (list): Main list.
+            language (str): Language.
 
         Returns:
-            List:
-                Indexes of sublist first items in list.
+            Future:
+                Loading language model.
         """
 
-        first, rest = sub[0], sub[1:]
-        start = 0
-        result = []
+        with self._loading_lock:
+            future, started = self._loading.get(language, (None, 0.0))
+            now = time.monotonic()
+            if future is None or (
+                future.done()
+                and future.exception()
+                and now - started >= self.model_retry_interval
+            ):
+                future = Future()
+                self._loading[language] = (future, now)
+                threading.Thread(
+                    target=self._load_language,
+                    args=(language, future),
+                    name=f"load-spacy-{language}",
+                    daemon=True,
+                ).start()
+
+        return future
+
+    def _load_language(self, language: str, future: Future) -> None:
+        """Load language model resolving the future."""
+        try:
+            self.lemmatizers[language] = self._load_model(language)
+            future.set_result(self.lemmatizers[language])
+        except FileNotFoundError as exc:
+            logger.error(f'Unable to load "{language}" language model: {exc}')
+            future.set_exception(UnknownLanguageError(language, self.lemmatizers))
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error(f'Unable to load "{language}" language model: {exc}')
+            future.set_exception(exc)
+
+    def _load_model(self, language: str) -> spacy.Language:
+        """Load language model from models directory, packages or GitHub."""
+        model_name = self.known_spacy_languages[language]
+        model_path = self._find_local_model(model_name)
+        if model_path is not None:
+            nlp = spacy.load(model_path, disable=["parser", "ner"])
+        else:
+            if not spacy.util.is_package(model_name):
+                self._install_model(language, model_name)
+            nlp = spacy.load(model_name, disable=["parser", "ner"])
+
+        if self.pipeline_profile == "minimal":
+            self._trim_pipeline(nlp)
+        elif self.pipeline_profile == "lookup":
+            self._use_lookup_lemmatizer(nlp)
+
+        logger.debug(f'Loaded "{language}" pipeline: {", ".join(nlp.pipe_names)}.')
+        return nlp
+
+    @staticmethod
+    def _trim_pipeline(nlp: spacy.Language) -> None:
+        """Remove pipeline components not required by lemmatizer."""
+        required = set()
+        for name in nlp.component_names:
+            if "token.lemma" not in nlp.get_pipe_meta(name).assigns:
+                continue
+
+            # Trainable lemmatizer has no mode and needs only embeddings
+            mode = getattr(nlp.get_pipe(name), "mode", None)
+            if mode is None:
+                requirements = ("tok2vec",)
+            elif mode in _LEMMATIZER_REQUIREMENTS:
+                requirements = _LEMMATIZER_REQUIREMENTS[mode]
+            else:
+                return
+
+            required.update((name, *requirements))
+
+        for name in list(nlp.component_names):
+            if name not in required:
+                nlp.remove_pipe(name)
+
+    @staticmethod
+    def _use_lookup_lemmatizer(nlp: spacy.Language) -> None:
+        """Replace pipeline with lemmatizer looking lemmas up by words only."""
+        lemmatizers = [
+            name
+            for name in nlp.component_names
+            if "token.lemma" in nlp.get_pipe_meta(name).assigns
+        ]
+        mode = (
+            getattr(nlp.get_pipe(lemmatizers[0]), "mode", None) if lemmatizers else None
+        )
+        if mode is None:
+            PhraseFinder._trim_pipeline(nlp)
+            return
+
+        # Pymorphy lemmatizers have their own lookup modes,
+        # others look lemmas up in spacy-lookups-data tables
+        mode = f"{mode}_lookup" if mode.startswith("pymorphy") else "lookup"
+        try:
+            spacy.blank(nlp.lang).add_pipe(
+                "lemmatizer", config={"mode": mode}
+            ).initialize()
+        except (ImportError, ValueError) as exc:
+            logger.warning(f'No "{mode}" lemmatizer for "{nlp.lang}" language: {exc}')
+            PhraseFinder._trim_pipeline(nlp)
+            return
+
+        for name in list(nlp.component_names):
+            nlp.remove_pipe(name)
+        nlp.add_pipe("lemmatizer", config={"mode": mode}).initialize()
+
+    def _find_local_model(self, model_name: str) -> Path | None:
+        """Find model data directory in models directory."""
+        if self.models_dir is None:
+            return None
+
+        for path in (
+            self.models_dir / model_name,
+            *sorted(self.models_dir.glob(f"{model_name}/{model_name}-*")),
+        ):
+            if (path / "config.cfg").is_file():
+                return path
+
+        return None
+
+    def _install_model(self, language: str, model_name: str) -> None:
+        """Install model package from models directory or GitHub."""
+        packages = []
+        if self.models_dir is not None:
+            packages = sorted(self.models_dir.glob(f"{model_name}-*.whl")) + sorted(
+                self.models_dir.glob(f"{model_name}-*.tar.gz")
+            )
+
+        if packages:
+            command = ["--no-index", "--no-deps", str(packages[-1])]
+        elif self.download_models:
+            command = [
+                "https://github.com/explosion/spacy-models/releases/download/"
+                f"{model_name}-3.3.0/{model_name}-3.3.0.tar.gz"
+            ]
+        else:
+            raise FileNotFoundError(f'"{model_name}" model not found.')
+
+        logger.info(f'Installing "{model_name}" model for "{language}" language.')
+        subprocess.check_call(
+            [sys.executable, "-m", "pip", "install", *command],
+            stdout=subprocess.DEVNULL,
+        )
+
+    def _get_lemmatizer(self, language: str) -> spacy.Language:
+        """Get lemmatizer for given language."""
+        if language in self.lemmatizers:
+            return self.lemmatizers[language]
+
+        if language not in self.known_spacy_languages:
+            raise UnknownLanguageError(language, self.known_spacy_languages.keys())
+
+        # Wait for language model loaded in background,
+        # failed load raises its exception
         try:
-            while True:
-                start = bigger.index(first, start) + 1
-                end = start + len(rest)
-                if not rest or bigger[start:end] == rest:
-                    result.append(start - 1)
-        except ValueError:
-            return result
+            return self.load_language(language).result(self.model_load_timeout)
+        except FutureTimeoutError as exc:
+            raise LanguageNotReadyError(language) from exc
@@ -0,0 +1,321 @@
+"""Belinsky PhraseFinder pool of nlp processes."""
+import gc
+import itertools
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+import typing as t
+from concurrent.futures import Future
+from multiprocessing.connection import Client, Connection, Listener, wait
+
+import numpy as np
+from loguru import logger
+
+from .matcher import PhraseMatcher
+from .phrase_finder import BasePhraseFinder, PhraseFinder, Tokens
+from ..utils import LRUCache, NLPPoolUnavailableError, RedisCache
+
+# Seconds between checks of languages loaded by other pool processes
+_LANGUAGES_SYNC_INTERVAL = 1.0
+
+
+class NLPPool:
+    """Fixed pool of processes owning spaCy models.
+
+    A supervisor process creates the PhraseFinder once and forks serving processes
+    sharing its models. Every serving process accepts jobs from a unix socket.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        processes: int,
+        authkey: bytes,
+        create_phrase_finder: t.Callable[[], PhraseFinder],
+    ):
+        """Initialize the NLPPool.
+
+        Args:
+            address (str): Unix socket path.
+            processes (int): Number of serving processes.
+            authkey (bytes): Key to authenticate clients.
+            create_phrase_finder (t.Callable): PhraseFinder factory.
+        """
+
+        self.address = address
+        self.processes = processes
+        self.authkey = authkey
+        self.create_phrase_finder = create_phrase_finder
+        self._supervisor_pid: int | None = None
+
+    def start(self) -> None:
+        """Fork pool supervisor process."""
+        if os.path.exists(self.address):
+            os.unlink(self.address)
+
+        pid = os.fork()
+        if pid == 0:
+            try:
+                self._supervise()
+            finally:
+                os._exit(0)  # pylint: disable=protected-access
+
+        self._supervisor_pid = pid
+
+        # Wait for the socket, so clients queue jobs while models are loading
+        while not os.path.exists(self.address):
+            if os.waitpid(pid, os.WNOHANG)[0]:
+                self._supervisor_pid = None
+                raise RuntimeError("NLP pool supervisor exited on start.")
+            time.sleep(0.01)
+
+        logger.info(f"Started NLP pool with {self.processes} processes.")
+
+    def stop(self) -> None:
+        """Stop pool supervisor and serving processes."""
+        if self._supervisor_pid is None:
+            return
+
+        try:
+            os.kill(self._supervisor_pid, signal.SIGTERM)
+            os.waitpid(self._supervisor_pid, 0)
+        except (ProcessLookupError, ChildProcessError):
+            pass
+        self._supervisor_pid = None
+
+    def _supervise(self) -> None:
+        """Load models and keep serving processes alive."""
+        processes: dict[int, multiprocessing.Process] = {}
+
+        def shutdown(*_) -> None:
+            for process in processes.values():
+                process.terminate()
+            os._exit(0)  # pylint: disable=protected-access
+
+        # Reset signal handlers inherited from the parent process
+        for signum in _INHERITED_SIGNALS:
+            signal.signal(signum, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, shutdown)
+
+        # Accept connections right away to queue jobs while models are loading
+        listener = Listener(
+            self.address, "AF_UNIX", backlog=socket.SOMAXCONN, authkey=self.authkey
+        )
+        phrase_finder = self.create_phrase_finder()
+
+        # Keep models memory shared between serving processes
+        gc.collect()
+        gc.freeze()
+
+        # Languages loaded on demand by any serving process as comma-separated codes
+        context = multiprocessing.get_context("fork")
+        languages = context.Array("c", 256)
+        while True:
+            while len(processes) < self.processes:
+                process = context.Process(
+                    target=_serve,
+                    args=(listener, phrase_finder, languages),
+                    name="belinsky-nlp-worker",
+                    daemon=True,
+                )
+                process.start()
+                processes[process.sentinel] = process
+
+            for sentinel in wait(list(processes)):
+                logger.warning(f"NLP pool process {processes.pop(sentinel).pid} died.")
+
+
+_INHERITED_SIGNALS = (
+    signal.SIGINT,
+    signal.SIGHUP,
+    signal.SIGQUIT,
+    signal.SIGCHLD,
+    signal.SIGUSR1,
+    signal.SIGUSR2,
+    signal.SIGWINCH,
+    signal.SIGTTIN,
+    signal.SIGTTOU,
+)
+
+
+def _serve(listener: Listener, phrase_finder: PhraseFinder, languages: t.Any) -> None:
+    """Process PhraseFinder jobs from pool clients.
+
+    Every client connection is served by its own thread until the client closes it.
+    """
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    gc.enable()
+
+    def load_language(language: str) -> None:
+        phrase_finder.load_language(language).result()
+        _share_language(languages, language)
+
+    # pylint: disable=protected-access
+    methods = {
+        "process_texts": phrase_finder._process_texts,
+        "lemmatize_phrases": phrase_finder._lemmatize_phrases,
+        "detect_language": phrase_finder.detect_language,
+        "detect_languages": phrase_finder.detect_languages,
+        "load_language": load_language,
+    }
+
+    def serve_connection(connection: Connection) -> None:
+        with connection:
+            while True:
+                try:
+                    method, args = connection.recv()
+                except (EOFError, OSError):
+                    return
+
+                try:
+                    response = True, methods[method](*args)
+                except Exception as exc:  # pylint: disable=broad-except
+                    response = False, exc
+
+                try:
+                    connection.send(response)
+                except OSError:
+                    return
+                except Exception as exc:  # pylint: disable=broad-except
+                    connection.send((False, RuntimeError(str(exc))))
+
+    threading.Thread(
+        target=_load_shared_languages,
+        args=(phrase_finder, languages),
+        name="belinsky-nlp-languages",
+        daemon=True,
+    ).start()
+
+    while True:
+        try:
+            connection = listener.accept()
+        except (OSError, multiprocessing.AuthenticationError) as exc:
+            logger.warning(f"Rejected NLP pool connection: {exc}")
+            continue
+
+        threading.Thread(
+            target=serve_connection,
+            args=(connection,),
+            name="belinsky-nlp-connection",
+            daemon=True,
+        ).start()
+
+
+def _share_language(languages: t.Any, language: str) -> None:
+    """Add language to languages loaded by every pool process."""
+    with languages.get_lock():
+        shared = languages.value.decode().split(",") if languages.value else []
+        if language not in shared:
+            languages.value = ",".join([*shared, language]).encode()
+
+
+def _load_shared_languages(phrase_finder: PhraseFinder, languages: t.Any) -> None:
+    """Load languages loaded by other pool processes in background."""
+    while True:
+        with languages.get_lock():
+            shared = languages.value.decode()
+
+        for language in filter(None, shared.split(",")):
+            if language not in phrase_finder.lemmatizers:
+                phrase_finder.load_language(language)
+
+        time.sleep(_LANGUAGES_SYNC_INTERVAL)
+
+
+class RemotePhraseFinder(BasePhraseFinder):
+    """PhraseFinder sending nlp jobs to the NLPPool.
+
+    Phrases matching runs in the calling process, texts processing runs in the pool.
+    Every thread keeps its own authenticated connection to the pool.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        authkey: bytes,
+        batch_size: int = 256,
+        result_cache: LRUCache | RedisCache | None = None,
+    ):
+        """Initialize the RemotePhraseFinder.
+
+        Args:
+            address (str): NLPPool unix socket path.
+            authkey (bytes): Key to authenticate in the pool.
+            batch_size (int): Number of texts sent to the pool in one job.
+            result_cache (LRUCache | RedisCache): Cache of find_phrases results.
+        """
+
+        super().__init__(batch_size, result_cache)
+        self.address = address
+        self.authkey = authkey
+        self._local = threading.local()
+
+    def detect_language(self, text: str) -> str:
+        """Detect text language in the pool."""
+        return self._call("detect_language", text)
+
+    def detect_languages(self, texts: list[str]) -> list[str]:
+        """Detect languages of texts in one pool job."""
+        return self._call("detect_languages", list(texts))
+
+    def load_language(self, language: str) -> Future:
+        """Load language model in the pool, every pool process loads it."""
+        future = Future()
+        future.set_result(self._call("load_language", language))
+        return future
+
+    def match_phrases_stream(
+        self,
+        texts: t.Iterable[tuple[str, t.Any]],
+        matcher: PhraseMatcher,
+        lang: str,
+    ) -> t.Iterator[tuple[dict[str, list[list[int]]], t.Any]]:
+        """Lazily find compiled phrases in a stream of texts processed in the pool."""
+        texts = iter(texts)
+        while batch := list(itertools.islice(texts, self.batch_size)):
+            tokenized = self._process_texts([text for text, _ in batch], lang)
+            for tokens, (_, context) in zip(tokenized, batch):
+                yield self._get_positions(tokens, matcher), context
+
+    def _process_texts(self, texts: t.Iterable[str], language: str) -> list[Tokens]:
+        return self._call("process_texts", list(texts), language)
+
+    def _lemmatize_phrases(self, phrases: list[str], language: str) -> list[np.ndarray]:
+        return self._call("lemmatize_phrases", phrases, language)
+
+    def _call(self, method: str, *args) -> t.Any:
+        """Send job to the pool and wait for its result.
+
+        Broken connection is opened again once, as pool processes are restarted.
+        """
+        for attempt in range(2):
+            connection = self._get_connection()
+            try:
+                connection.send((method, args))
+                success, result = connection.recv()
+                break
+            except (EOFError, OSError) as exc:
+                self._local.connection = None
+                connection.close()
+                if attempt:
+                    raise NLPPoolUnavailableError() from exc
+
+        if not success:
+            raise result
+        return result
+
+    def _get_connection(self) -> Connection:
+        """Get connection of current thread opening it on first use."""
+        # Connections inherited from parent process are not reused after fork
+        pid, connection = getattr(self._local, "connection", None) or (None, None)
+        if pid != os.getpid():
+            try:
+                connection = Client(self.address, "AF_UNIX", authkey=self.authkey)
+            except (OSError, multiprocessing.AuthenticationError) as exc:
+                raise NLPPoolUnavailableError() from exc
+            self._local.connection = (os.getpid(), connection)
+
+        return connection
@@ -0,0 +1,202 @@
+"""Belinsky PhraseFinder phrase sets registry."""
+import typing as t
+
+from loguru import logger
+
+from .matcher import PhraseMatcher
+from .phrase_finder import BasePhraseFinder
+from ..utils import LRUCache, UnknownPhraseSetError
+from ... import database, models
+
+
+class PhraseSetRegistry:
+    """Registry of phrase sets compiled once and reused across requests.
+
+    Phrase sets are accessible only by users who registered them, phrase sets
+    of other users are reported as unknown. Compiled matchers and phrase sets
+    languages and owners are kept in bounded caches of every worker.
+    """
+
+    def __init__(
+        self,
+        phrase_finder: BasePhraseFinder,
+        cache_max_entries: int = 1_000,
+        cache_max_bytes: int = 256 * 1024**2,
+    ):
+        """Initialize the PhraseSetRegistry.
+
+        Args:
+            phrase_finder (BasePhraseFinder): Worker used to compile phrase sets.
+            cache_max_entries (int): Maximum number of cached matchers.
+            cache_max_bytes (int): Maximum size of cached matchers in bytes.
+        """
+
+        self.phrase_finder = phrase_finder
+
+        # Phrase sets languages and owners by phrase set id
+        self._phrase_sets = LRUCache(
+            "phrase_sets", cache_max_entries, cache_max_bytes // 16
+        )
+        # Compiled matchers by phrase set id and language
+        self._matchers = LRUCache(
+            "phrase_set_matchers",
+            cache_max_entries,
+            cache_max_bytes,
+            lambda matcher: matcher.nbytes,
+        )
+
+    def register(
+        self,
+        phrases: t.Iterable[str],
+        language: str | None = None,
+        user_id: int | None = None,
+    ) -> models.PhraseSet:
+        """Register a phrase set.
+
+        Arguments:
+            phrases (t.Iterable): Phrases to be found.
+            language (str): Phrases language. If not provided,
+                phrases are compiled for every text language on demand.
+            user_id (int): Id of user owning the phrase set.
+
+        Returns:
+            models.PhraseSet:
+                Registered phrase set.
+        """
+
+        phrases = list(dict.fromkeys(phrases))
+
+        # Compile phrases before saving them to catch unknown language
+        matcher = None
+        if language is not None:
+            matcher = self.phrase_finder.compile_phrases(phrases, language)
+
+        phrase_set = database.add_instance(
+            models.PhraseSet, phrases=phrases, language=language, user_id=user_id
+        )
+        self._phrase_sets.set(phrase_set.id, (language, user_id))
+        if matcher is not None:
+            self._matchers.set((phrase_set.id, language), matcher)
+
+        logger.debug(f"Registered {phrase_set} phrase set.")
+        return phrase_set
+
+    def get_phrase_set(self, phrase_set_id: int, user_id: int) -> models.PhraseSet:
+        """Get registered phrase set.
+
+        Arguments:
+            phrase_set_id (int): Phrase set id.
+            user_id (int): Id of user requesting the phrase set.
+
+        Returns:
+            models.PhraseSet:
+                Registered phrase set.
+        """
+
+        phrase_set = database.get_instance(models.PhraseSet, id=phrase_set_id)
+        if phrase_set is None or phrase_set.user_id != user_id:
+            raise UnknownPhraseSetError(phrase_set_id)
+
+        self._phrase_sets.set(phrase_set.id, (phrase_set.language, phrase_set.user_id))
+        return phrase_set
+
+    def get_matcher(
+        self, phrase_set_id: int, user_id: int, language: str
+    ) -> PhraseMatcher:
+        """Get phrase set matcher compiled for language.
+
+        Arguments:
+            phrase_set_id (int): Phrase set id.
+            user_id (int): Id of user requesting the phrase set.
+            language (str): Language.
+
+        Returns:
+            PhraseMatcher:
+                Compiled phrase set matcher.
+        """
+
+        self.get_language(phrase_set_id, user_id, language)
+        matcher = self._matchers.get((phrase_set_id, language))
+        if matcher is None:
+            phrase_set = self.get_phrase_set(phrase_set_id, user_id)
+            matcher = self.phrase_finder.compile_phrases(phrase_set.phrases, language)
+            self._matchers.set((phrase_set_id, language), matcher)
+            logger.debug(f'Compiled {phrase_set} phrase set for "{language}".')
+
+        return matcher
+
+    def find_phrases(
+        self, text: str, phrase_set_id: int, user_id: int, lang: str | None = None
+    ) -> dict[str, list[list[int]]]:
+        """Find registered phrase set in text.
+
+        Arguments:
+            text (str): Text to be processed.
+            phrase_set_id (int): Phrase set id.
+            user_id (int): Id of user requesting the phrase set.
+            lang (str): Language. If not provided, phrase set language is used.
+
+        Returns:
+            Dict:
+                Return phrases and their indexes in text.
+        """
+
+        lang = self.get_language(phrase_set_id, user_id, lang)
+        if lang is None:
+            lang = self.phrase_finder.detect_language(text)
+
+        # Find phrases
+        matcher = self.get_matcher(phrase_set_id, user_id, lang)
+        return self.phrase_finder.match_phrases(text, matcher, lang)
+
+    def find_phrases_many(
+        self,
+        texts: t.Iterable[str],
+        phrase_set_id: int,
+        user_id: int,
+        lang: str | None = None,
+    ) -> list[dict[str, list[list[int]]]]:
+        """Find registered phrase set in texts processing them in batches.
+
+        Arguments:
+            texts (t.Iterable): Texts to be processed.
+            phrase_set_id (int): Phrase set id.
+            user_id (int): Id of user requesting the phrase set.
+            lang (str): Language. If not provided, phrase set language is used.
+
+        Returns:
+            List:
+                Return phrases and their indexes for every text.
+        """
+
+        return self.phrase_finder.match_phrases_many(
+            texts,
+            lambda language: self.get_matcher(phrase_set_id, user_id, language),
+            self.get_language(phrase_set_id, user_id, lang),
+        )
+
+    def get_language(
+        self, phrase_set_id: int, user_id: int, lang: str | None
+    ) -> str | None:
+        """Get language of texts to be processed with phrase set.
+
+        Arguments:
+            phrase_set_id (int): Phrase set id.
+            user_id (int): Id of user requesting the phrase set.
+            lang (str): Requested language.
+
+        Returns:
+            str or None:
+                Requested language or phrase set language if not requested.
+        """
+
+        phrase_set = self._phrase_sets.get(phrase_set_id)
+        if phrase_set is None:
+            self.get_phrase_set(phrase_set_id, user_id)
+            phrase_set = self._phrase_sets.get(phrase_set_id)
+
+        language, owner_id = phrase_set
+        if owner_id != user_id:
+            raise UnknownPhraseSetError(phrase_set_id)
+
+        return language if lang is None else lang
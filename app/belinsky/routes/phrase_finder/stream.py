@@ -0,0 +1,66 @@
+"""Read and write Phrase Finder NDJSON streams."""
+import json
+import typing as t
+
+
+def read_documents(
+    stream: t.BinaryIO, max_line_length: int
+) -> t.Iterator[tuple[str, tuple[t.Any, str | None]]]:
+    """Lazily read newline-delimited JSON documents.
+
+    Every line is a JSON object with "text" and optional "id" keys, or a JSON string.
+
+    Args:
+        stream (t.BinaryIO): Input stream.
+        max_line_length (int): Maximum line length in bytes.
+
+    Yields:
+        Tuple:
+            Document text with its id and parsing error if any.
+    """
+
+    line_number = 0
+    while line := stream.readline(max_line_length + 1):
+        document_id = line_number
+        line_number += 1
+
+        # Skip too long lines
+        if len(line) > max_line_length and not line.endswith(b"\n"):
+            while line and not line.endswith(b"\n"):
+                line = stream.readline(max_line_length + 1)
+            yield "", (document_id, f"Document is longer than {max_line_length} bytes.")
+            continue
+
+        if not line.strip():
+            continue
+
+        # Parse document
+        try:
+            document = json.loads(line)
+        except ValueError:
+            yield "", (document_id, "Document is not a valid JSON.")
+            continue
+
+        if isinstance(document, dict):
+            document_id = document.get("id", document_id)
+            document = document.get("text")
+        if not isinstance(document, str) or not document:
+            yield "", (document_id, "No text given in document.")
+            continue
+
+        yield document, (document_id, None)
+
+
+def format_result(document_id: t.Any, **kwargs) -> str:
+    """Format document result as NDJSON line.
+
+    Args:
+        document_id (t.Any): Document id.
+        **kwargs: Document result.
+
+    Returns:
+        str:
+            NDJSON line.
+    """
+
+    return json.dumps({"id": document_id} | kwargs, ensure_ascii=False) + "\n"
@@ -1,26 +1,82 @@
 """Belinsky TextAnalyzer blueprint."""
+import json
+import re
+import typing as t
+
+import click
 from flask import Blueprint, request, render_template, flash
 from flask_login import login_required
 from google.api_core import exceptions
 from loguru import logger
 from prometheus_client import Summary
 
+from .backends import ClassificationBackend, GoogleCloudBackend, LocalBackend
 from .formatter import format_analyzis
 from .text_analyzer import TextAnalyzer
+from ..auth import scope_required
+from ..utils import check_request_keys, check_string_lists, lazy_object
 from ... import config
 
 # Initialize prometheus metrics.
 TEXT_ANALYZER_LATENCY = Summary(
     "text_analyzer_latency", 'Latency of "phrase-finder" request'
 )
+TEXT_ANALYZER_BATCH_LATENCY = Summary(
+    "text_analyzer_batch_latency", 'Latency of "text-analyzer/batch" request'
+)
+
+# Google Cloud NLP error of texts in unsupported language
+UNSUPPORTED_LANGUAGE = re.compile(r"The language (\S+) is not supported")
+
+
+def create_backend() -> ClassificationBackend:
+    """Create TextAnalyzer classification backend from configuration."""
+    if config.TEXT_ANALYZER_BACKEND == "local":
+        return LocalBackend(config.TEXT_ANALYZER_LOCAL_MODEL_PATH)
 
-# Initialize TextAnalyzer worker.
-text_analyzer_worker = TextAnalyzer(config.GOOGLE_CLOUD_CREDENTIALS)
-available_analyzis = text_analyzer_worker.available_analyzis()
+    return GoogleCloudBackend(
+        config.GOOGLE_CLOUD_CREDENTIALS,
+        config.TEXT_ANALYZER_API_ENDPOINT,
+        config.TEXT_ANALYZER_MAX_CONCURRENCY,
+        channels=config.TEXT_ANALYZER_CHANNELS,
+        keepalive_time=config.TEXT_ANALYZER_KEEPALIVE_TIME,
+        timeout=config.TEXT_ANALYZER_TIMEOUT,
+    )
+
+
+@lazy_object
+def get_text_analyzer_worker() -> TextAnalyzer:
+    """Get TextAnalyzer worker creating its backend on first use."""
+    return TextAnalyzer(
+        create_backend(),
+        config.TEXT_ANALYZER_CACHE_MAX_ENTRIES,
+        config.TEXT_ANALYZER_CACHE_MAX_BYTES,
+        config.TEXT_ANALYZER_CACHE_TTL,
+    )
+
+
+def warmup() -> None:
+    """Create TextAnalyzer worker loading its backend credentials or model."""
+    get_text_analyzer_worker()
+    logger.debug("Warmed up Text Analyzer.")
+
+
+def post_fork() -> None:
+    """Connect TextAnalyzer backend in forked worker process."""
+    get_text_analyzer_worker().connect()
+    logger.debug("Connected Text Analyzer backend.")
+
+
+def __getattr__(name: str) -> t.Any:
+    """Get module worker, creating it on first access."""
+    if name == "text_analyzer_worker":
+        return get_text_analyzer_worker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @TEXT_ANALYZER_LATENCY.time()
 @login_required
+@scope_required("text_analyzer")
 def text_analyzer() -> str | tuple[dict[str, str | list | int], int]:
     """Generate Text Analyzer home page.
 
@@ -28,6 +84,9 @@ def text_analyzer() -> str | tuple[dict[str, str | list | int], int]:
         str: HTML source of Text Analyzer page.
     """
 
+    worker = get_text_analyzer_worker()
+    available_analyzis = worker.available_analyzis()
+
     # Check request method
     if request.method == "GET":
         return render_template(
@@ -47,15 +106,19 @@ def text_analyzer() -> str | tuple[dict[str, str | list | int], int]:
         logger.debug(f'Text not found in "{request}" request.')
     else:
         try:
-            analyzis = getattr(text_analyzer_worker, analyzis_type)(text)
+            analyzis = getattr(worker, analyzis_type)(text)
             logger.debug(
                 f'Analyzed "{analyzis}" with "{analyzis_type}" type '
                 f"in text with {len(text)} length."
             )
         except exceptions.InvalidArgument as exc:
-            flash(f"Unknown language: {exc.message[13:15]}.")
+            unsupported_language = UNSUPPORTED_LANGUAGE.match(exc.message)
+            if unsupported_language:
+                flash(f"Unknown language: {unsupported_language.group(1)}.")
+            else:
+                flash(exc.message)
             logger.debug(
-                f'Unknown "{exc.message[13:15]}" language caught on {request} request.'
+                f'Invalid argument "{exc.message}" caught on {request} request.'
             )
 
     # Response with raw data if required
@@ -80,6 +143,87 @@ def text_analyzer() -> str | tuple[dict[str, str | list | int], int]:
     )
 
 
+@TEXT_ANALYZER_BATCH_LATENCY.time()
+@login_required
+@scope_required("text_analyzer")
+def text_analyzer_batch() -> tuple[dict[str, str | list | int], int]:
+    """Classify multiple texts concurrently.
+    ---
+    Body (JSON):
+        - texts: Texts to be classified.
+
+    Responses:
+        200:
+            description: Return classification or error for every text. Errors
+                statuses are 406 for invalid texts, 502 for api errors and 504 for
+                api calls exceeding their deadline.
+            schema:
+                analyzis_results: [
+                    {"categories": [{"name": "/Science", "confidence": 0.9}]},
+                    {"error": "Error description.", "status": 406}
+                ]
+                status: 200
+        400:
+            description: Json body or ['texts'] key not found in request body
+                OR ['texts'] is not a non-empty list of strings.
+            schema:
+                error: Error description.
+                status: 400
+    """
+
+    # Check input body
+    check = check_request_keys({"texts"})
+    if check:
+        return check
+    texts = request.json["texts"]
+    texts = [texts] if isinstance(texts, str) else texts
+    check = check_string_lists(texts=texts)
+    if check:
+        return check
+    if not texts:
+        response = {"error": "No texts given. Try again please.", "status": 400}
+        return response, 400
+
+    # Process texts
+    analyzis_results = []
+    results = get_text_analyzer_worker().classify_texts(texts, return_exceptions=True)
+    for result in results:
+        if isinstance(result, exceptions.InvalidArgument):
+            analyzis_results.append({"error": result.message, "status": 406})
+        elif isinstance(result, (exceptions.DeadlineExceeded, exceptions.RetryError)):
+            analyzis_results.append({"error": result.message, "status": 504})
+        elif isinstance(result, exceptions.GoogleAPICallError):
+            analyzis_results.append({"error": result.message, "status": 502})
+        elif isinstance(result, Exception):
+            raise result
+        else:
+            analyzis_results.append(type(result).to_dict(result))
+
+    logger.debug(f"Classified {len(texts)} texts.")
+    response = {"analyzis_results": analyzis_results, "status": 200}
+    return response, 200
+
+
+@click.command("train-local-model")
+@click.argument("dataset", type=click.File(encoding="utf-8"))
+@click.option("--output", required=True, help="Model file path.")
+@click.option("--epochs", default=10, show_default=True, help="Training epochs.")
+def train_local_model(dataset: t.TextIO, output: str, epochs: int) -> None:
+    """Train local classification backend model.
+
+    Dataset contains a JSON like {"text": "...", "category": "/Science"} per line.
+    """
+
+    samples = [json.loads(line) for line in dataset if line.strip()]
+    LocalBackend.train(
+        output,
+        [sample["text"] for sample in samples],
+        [sample["category"] for sample in samples],
+        epochs=epochs,
+    )
+    click.echo(f"Trained local model on {len(samples)} texts in {output}.")
+
+
 def create_blueprint_text_analyzer() -> Blueprint:
     """Create TextAnalyzer blueprint."""
     # Create Flask blueprint
@@ -91,9 +235,23 @@ def create_blueprint_text_analyzer() -> Blueprint:
     text_analyzer_bp.add_url_rule(
         "/text-analyzer", view_func=text_analyzer, methods=["GET", "POST"]
     )
+    text_analyzer_bp.add_url_rule(
+        "/text-analyzer/batch", view_func=text_analyzer_batch, methods=["POST"]
+    )
+
+    # Add offline commands
+    text_analyzer_bp.cli.add_command(train_local_model)
 
     logger.debug("Created Text Analyzer blueprint.")
     return text_analyzer_bp
 
 
-__all__ = ["create_blueprint_text_analyzer", "TextAnalyzer"]
+__all__ = [
+    "create_blueprint_text_analyzer",
+    "get_text_analyzer_worker",
+    "warmup",
+    "post_fork",
+    "GoogleCloudBackend",
+    "LocalBackend",
+    "TextAnalyzer",
+]
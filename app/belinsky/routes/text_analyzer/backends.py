@@ -0,0 +1,282 @@
+"""Belinsky TextAnalyzer classification backends."""
+import abc
+import asyncio
+import itertools
+import re
+import time
+import typing as t
+import zlib
+
+import grpc
+import numpy as np
+from google.api_core import exceptions, retry
+from google.cloud import language_v1 as api
+from google.cloud.language_v1.services.language_service import transports
+from google.oauth2.service_account import Credentials
+from prometheus_client import Histogram
+
+# Initialize prometheus metrics
+CHANNEL_LATENCY = Histogram(
+    "text_analyzer_channel_latency_seconds",
+    "Latency of Google Cloud NLP api calls by gRPC channel",
+    ["channel"],
+)
+
+_WORD = re.compile(r"\w+")
+
+
+class ClassificationBackend(abc.ABC):
+    """Text classification backend returning Google Cloud NLP responses."""
+
+    @staticmethod
+    def available_analyzis() -> dict[str, str]:
+        """List of available analyzis."""
+        return {"Classify text": "classify_text"}
+
+    @abc.abstractmethod
+    async def classify_text(self, text: str) -> api.ClassifyTextResponse:
+        """Classifies a document into categories.
+
+        Args:
+            text (str): Text to be classified.
+
+        Returns:
+            api.ClassifyTextResponse:
+                Text categories.
+        """
+
+    async def connect(self) -> None:
+        """Open connections of the backend in the running event loop."""
+
+
+# pylint: disable=too-many-instance-attributes
+class GoogleCloudBackend(ClassificationBackend):
+    """Google Cloud NLP api backend with bounded concurrency.
+
+    Api calls are spread round-robin over a pool of gRPC channels, each with
+    its own kept alive connection, as a single HTTP/2 connection caps throughput.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        google_service_credentials: dict | None,
+        api_endpoint: str | None = None,
+        max_concurrency: int = 16,
+        *,
+        channels: int = 4,
+        keepalive_time: float = 60,
+        timeout: float = 10,
+    ):
+        """Initialize the GoogleCloudBackend.
+
+        Args:
+            google_service_credentials (dict): Google Cloud credentials.
+            api_endpoint (str): Google Cloud NLP api endpoint. Without credentials
+                it's called over an insecure channel, as emulators and fake servers.
+            max_concurrency (int): Maximum number of concurrent api calls.
+            channels (int): Number of gRPC channels.
+            keepalive_time (float): Seconds between keepalive pings of idle
+                connections.
+            timeout (float): Deadline of every api call in seconds, retries included.
+        """
+
+        self.credentials = None
+        if google_service_credentials:
+            self.credentials = Credentials.from_service_account_info(
+                google_service_credentials
+            )
+        self.api_endpoint = api_endpoint
+        self.max_concurrency = max_concurrency
+        self.channels = channels
+        self.keepalive_time = keepalive_time
+        self.timeout = timeout
+        self.retry = retry.AsyncRetry(
+            initial=0.1,
+            maximum=1.0,
+            multiplier=1.3,
+            predicate=retry.if_exception_type(exceptions.ServiceUnavailable),
+            deadline=timeout,
+        )
+
+        # Clients are bound to the event loop they're created in
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._clients: list[api.LanguageServiceAsyncClient] = []
+        self._next_client: t.Iterator[int] = iter(())
+        self._semaphore: asyncio.Semaphore | None = None
+
+    async def classify_text(self, text: str) -> api.ClassifyTextResponse:
+        """Classifies a document into categories with Google Cloud NLP api."""
+        self._get_clients()
+        document = api.Document(content=text, type_=api.Document.Type.PLAIN_TEXT)
+
+        async with self._semaphore:
+            index = next(self._next_client)
+            start = time.perf_counter()
+            try:
+                return await self._clients[index].classify_text(
+                    document=document, retry=self.retry, timeout=self.timeout
+                )
+            finally:
+                CHANNEL_LATENCY.labels(str(index)).observe(time.perf_counter() - start)
+
+    async def connect(self) -> None:
+        """Create api clients and start connecting their channels."""
+        for client in self._get_clients():
+            client.transport.grpc_channel.get_state(try_to_connect=True)
+
+    def _get_clients(self) -> list[api.LanguageServiceAsyncClient]:
+        """Get api clients bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._clients = [self._create_client() for _ in range(self.channels)]
+            self._next_client = itertools.cycle(range(self.channels))
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        return self._clients
+
+    def _create_client(self) -> api.LanguageServiceAsyncClient:
+        """Create Google Cloud NLP api async client with its own channel."""
+        options = [
+            ("grpc.keepalive_time_ms", int(self.keepalive_time * 1000)),
+            ("grpc.keepalive_timeout_ms", 20_000),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.max_pings_without_data", 0),
+            # Channels share connections of the same target without it
+            ("grpc.use_local_subchannel_pool", 1),
+        ]
+
+        transport = transports.LanguageServiceGrpcAsyncIOTransport
+        if self.credentials is None and self.api_endpoint:
+            channel = grpc.aio.insecure_channel(self.api_endpoint, options=options)
+        else:
+            host = self.api_endpoint or transport.DEFAULT_HOST
+            channel = transport.create_channel(
+                host if ":" in host else f"{host}:443",
+                credentials=self.credentials,
+                options=options,
+            )
+
+        return api.LanguageServiceAsyncClient(transport=transport(channel=channel))
+
+
+class LocalBackend(ClassificationBackend):
+    """In-process linear classifier over hashed words and bigrams.
+
+    The model file is a numpy archive with "weights" of shape
+    (features, categories), "bias" and "categories" names like "/Science".
+    """
+
+    def __init__(self, model_path: str, min_confidence: float = 0.1):
+        """Initialize the LocalBackend.
+
+        Args:
+            model_path (str): Model file created by LocalBackend.train.
+            min_confidence (float): Minimum confidence of returned categories.
+        """
+
+        with np.load(model_path) as model:
+            self.weights = np.asarray(model["weights"])
+            self.bias = np.asarray(model["bias"])
+            self.categories = np.asarray(model["categories"]).tolist()
+        self.min_confidence = min_confidence
+
+    async def classify_text(self, text: str) -> api.ClassifyTextResponse:
+        """Classifies a document into categories with the local model.
+
+        Scoring runs in the default executor, so it doesn't block the event loop
+        shared by concurrent requests.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._classify_text, text
+        )
+
+    def _classify_text(self, text: str) -> api.ClassifyTextResponse:
+        """Score text categories with the local model."""
+        indexes, values = _hash_features(text, len(self.weights))
+        if indexes.size == 0:
+            raise exceptions.InvalidArgument(
+                "Invalid text content: too few tokens (words) to process."
+            )
+
+        confidences = _softmax(values @ self.weights[indexes] + self.bias)
+        order = np.argsort(-confidences)
+        return api.ClassifyTextResponse(
+            categories=[
+                api.ClassificationCategory(
+                    name=self.categories[index], confidence=confidences[index]
+                )
+                for index in order.tolist()
+                if confidences[index] >= self.min_confidence
+            ]
+        )
+
+    # pylint: disable=too-many-arguments,too-many-locals
+    @staticmethod
+    def train(
+        path: str,
+        texts: t.Iterable[str],
+        categories: t.Iterable[str],
+        *,
+        features: int = 2**18,
+        epochs: int = 10,
+        learning_rate: float = 0.5,
+    ) -> None:
+        """Train model with stochastic gradient descent and save it.
+
+        Args:
+            path (str): Model file path.
+            texts (t.Iterable): Training texts.
+            categories (t.Iterable): Category of every text.
+            features (int): Number of hashed features.
+            epochs (int): Number of passes over training texts.
+            learning_rate (float): Gradient descent step.
+        """
+
+        samples = [_hash_features(text, features) for text in texts]
+        categories = ["/" + category.lstrip("/") for category in categories]
+        names = sorted(set(categories))
+        targets = np.eye(len(names), dtype=np.float32)[
+            [names.index(category) for category in categories]
+        ]
+
+        weights = np.zeros((features, len(names)), dtype=np.float32)
+        bias = np.zeros(len(names), dtype=np.float32)
+        order = np.arange(len(samples))
+        rand = np.random.default_rng(0)
+        for _ in range(epochs):
+            rand.shuffle(order)
+            for sample in order.tolist():
+                indexes, values = samples[sample]
+                gradient = _softmax(values @ weights[indexes] + bias) - targets[sample]
+                weights[indexes] -= learning_rate * np.outer(values, gradient)
+                bias -= learning_rate * gradient
+
+        with open(path, "wb") as file:
+            np.savez_compressed(
+                file, weights=weights, bias=bias, categories=np.array(names)
+            )
+
+
+def _hash_features(text: str, features: int) -> tuple[np.ndarray, np.ndarray]:
+    """Hash text words and bigrams into normalized feature counts."""
+    words = _WORD.findall(text.lower())
+    tokens = words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+    hashes = np.fromiter(
+        (zlib.crc32(token.encode()) % features for token in tokens),
+        dtype=np.int64,
+        count=len(tokens),
+    )
+
+    indexes, counts = np.unique(hashes, return_counts=True)
+    values = counts.astype(np.float32)
+    if values.size:
+        values /= np.linalg.norm(values)
+    return indexes, values
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    """Convert logits to probabilities."""
+    exponents = np.exp(logits - logits.max())
+    return exponents / exponents.sum()
@@ -1,43 +1,155 @@
 """Belinsky TextAnalyzer nlp worker."""
+import asyncio
+import hashlib
+import os
+import threading
+import time
+import typing as t
+
 from google.cloud import language_v1 as api
-from google.oauth2.service_account import Credentials
+from prometheus_client import Counter
+
+from .backends import ClassificationBackend
+from ..utils import LRUCache
+
+# Initialize prometheus metrics
+SAVED_CALLS = Counter(
+    "text_analyzer_saved_calls",
+    "Number of classification backend calls saved by cache or coalescing",
+    ["reason"],
+)
+SAVED_LATENCY = Counter(
+    "text_analyzer_saved_latency_seconds",
+    "Classification backend latency saved by cache hits",
+)
 
 
 class TextAnalyzer:
-    """Belinsky TextAnalyzer nlp worker."""
+    """Belinsky TextAnalyzer nlp worker.
 
-    def __init__(self, google_service_credentials: dict):
+    Classification backend is called in a background event loop, so many texts
+    are analyzed concurrently. Results are cached by text hash and concurrent
+    calls for the same text are coalesced into one backend call.
+    """
+
+    def __init__(
+        self,
+        backend: ClassificationBackend,
+        cache_max_entries: int = 10_000,
+        cache_max_bytes: int = 16 * 1024**2,
+        cache_ttl: float = 24 * 3600,
+    ):
         """Initialize the TextAnalyzer.
 
         Args:
-            google_service_credentials (dict): Google Cloud credentials.
+            backend (ClassificationBackend): Google Cloud NLP api or local model.
+            cache_max_entries (int): Maximum number of cached classifications.
+            cache_max_bytes (int): Maximum size of cached classifications in bytes.
+            cache_ttl (float): Seconds to keep cached classifications.
+        """
+
+        self.backend = backend
+
+        # Classifications are cached serialized with their backend call latency
+        self.cache = LRUCache(
+            "text_analyzer_classifications",
+            cache_max_entries,
+            cache_max_bytes,
+            lambda value: len(value[0]),
+            cache_ttl,
+        )
+
+        # Event loop is created on demand in every process,
+        # as threads and gRPC channels don't survive fork
+        self._pid: int | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._in_flight: dict[bytes, asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+    def connect(self) -> None:
+        """Start event loop of current process and open backend connections.
+
+        Called in forked workers, so first requests don't wait for them.
         """
 
-        # Initialize Google Cloud NLP api client
-        credentials = Credentials.from_service_account_info(google_service_credentials)
-        self.client = api.LanguageServiceClient(credentials=credentials)
+        asyncio.run_coroutine_threadsafe(
+            self.backend.connect(), self._get_loop()
+        ).result()
 
-    @staticmethod
-    def available_analyzis():
+    def available_analyzis(self) -> dict[str, str]:
         """List of available analyzis."""
-        return {"Classify text": "classify_text"}
+        return self.backend.available_analyzis()
 
     def classify_text(self, text: str) -> api.ClassifyTextResponse:
         """Classifies a document into categories."""
-        document = self._create_document(text)
+        return self.classify_texts([text])[0]
 
-        return self.client.classify_text(document=document)
-
-    @staticmethod
-    def _create_document(text: str) -> api.Document:
-        """Create a gRPC document from text.
+    def classify_texts(
+        self, texts: t.Iterable[str], return_exceptions: bool = False
+    ) -> list[api.ClassifyTextResponse | Exception]:
+        """Classifies documents into categories concurrently.
 
         Args:
-            text (str): Text to be converted to grpc Document.
+            texts (t.Iterable): Texts to be classified.
+            return_exceptions (bool): Return backend errors in place of failed texts
+                results instead of raising the first of them.
 
         Returns:
-            api.Document:
-                Text converted to Google Cloud NLP request format.
+            list:
+                Classification of every text.
         """
 
-        return api.Document(content=text, type_=api.Document.Type.PLAIN_TEXT)
+        async def classify_all() -> list[api.ClassifyTextResponse | Exception]:
+            return await asyncio.gather(
+                *map(self.classify_text_async, texts),
+                return_exceptions=return_exceptions,
+            )
+
+        return asyncio.run_coroutine_threadsafe(
+            classify_all(), self._get_loop()
+        ).result()
+
+    async def classify_text_async(self, text: str) -> api.ClassifyTextResponse:
+        """Classifies a document into categories in the TextAnalyzer event loop."""
+        key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        cached = self.cache.get(key)
+        if cached is not None:
+            SAVED_CALLS.labels("cache").inc()
+            SAVED_LATENCY.inc(cached[1])
+            return api.ClassifyTextResponse.deserialize(cached[0])
+
+        # Wait for the same text classified concurrently
+        task = self._in_flight.get(key)
+        if task is not None:
+            SAVED_CALLS.labels("coalescing").inc()
+        else:
+            task = asyncio.create_task(self._classify(text, key))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        # Shield the call shared by waiters from cancellation of one of them
+        return await asyncio.shield(task)
+
+    async def _classify(self, text: str, key: bytes) -> api.ClassifyTextResponse:
+        """Call backend to classify text and cache its response."""
+        start = time.perf_counter()
+        response = await self.backend.classify_text(text)
+        latency = time.perf_counter() - start
+
+        self.cache.set(key, (api.ClassifyTextResponse.serialize(response), latency))
+        return response
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Get event loop running in background thread of current process."""
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._in_flight = {}
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever,
+                    name="belinsky-text-analyzer",
+                    daemon=True,
+                ).start()
+
+            return self._loop
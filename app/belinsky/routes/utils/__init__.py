@@ -1,10 +1,27 @@
 """Belinsky routes utils."""
-from .checks import check_request_keys
-from .exceptions import UnknownLanguageError
+from .cache import LRUCache, RedisCache
+from .checks import check_optional_strings, check_request_keys, check_string_lists
+from .exceptions import (
+    LanguageNotReadyError,
+    NLPPoolUnavailableError,
+    UnknownLanguageError,
+    UnknownPhraseSetError,
+)
+from .lazy import lazy_object
 from .nlp_utils import format_language_name
+from .rate_limit import RateLimiter
 
 __all__ = [
+    "LRUCache",
+    "RedisCache",
+    "RateLimiter",
     "check_request_keys",
+    "check_string_lists",
+    "check_optional_strings",
+    "lazy_object",
     "format_language_name",
+    "LanguageNotReadyError",
+    "NLPPoolUnavailableError",
     "UnknownLanguageError",
+    "UnknownPhraseSetError",
 ]
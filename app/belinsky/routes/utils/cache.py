@@ -0,0 +1,220 @@
+"""Belinsky caches."""
+import json
+import sys
+import threading
+import time
+import typing as t
+from collections import OrderedDict
+
+from loguru import logger
+from prometheus_client import Counter
+
+# Initialize prometheus metrics
+CACHE_HITS = Counter("cache_hits", "Number of cache hits", ["cache"])
+CACHE_MISSES = Counter("cache_misses", "Number of cache misses", ["cache"])
+CACHE_EVICTIONS = Counter("cache_evictions", "Number of cache evictions", ["cache"])
+
+
+# pylint: disable=too-many-instance-attributes
+class LRUCache:
+    """Thread-safe least recently used cache bounded by entries and bytes."""
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        max_bytes: int,
+        sizeof: t.Callable[[t.Any], int] = sys.getsizeof,
+        ttl: float = 0,
+    ):
+        """Initialize the LRUCache.
+
+        Args:
+            name (str): Cache name used in prometheus metrics.
+            max_entries (int): Maximum number of cached values. 0 disables cache.
+            max_bytes (int): Maximum approximate size of cached values in bytes.
+            sizeof (t.Callable): Function to estimate value size in bytes.
+            ttl (float): Seconds to keep cached values. 0 keeps them until evicted.
+        """
+
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.ttl = ttl
+
+        self.size = 0
+        self._data: OrderedDict[t.Hashable, tuple[t.Any, int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._hits = CACHE_HITS.labels(name)
+        self._misses = CACHE_MISSES.labels(name)
+        self._evictions = CACHE_EVICTIONS.labels(name)
+
+    def __len__(self) -> int:
+        """Return number of cached values."""
+        return len(self._data)
+
+    def __contains__(self, key: t.Hashable) -> bool:
+        """Check if key is cached without updating its recency."""
+        return key in self._data
+
+    def get(self, key: t.Hashable, default: t.Any = None) -> t.Any:
+        """Get cached value and mark it as recently used.
+
+        Args:
+            key (t.Hashable): Cache key.
+            default (t.Any): Value to be returned if key is not cached.
+
+        Returns:
+            t.Any:
+                Cached value or default.
+        """
+
+        with self._lock:
+            if key in self._data and self._data[key][2] < time.monotonic():
+                self._pop(key)
+
+            if key not in self._data:
+                self._misses.inc()
+                return default
+
+            self._data.move_to_end(key)
+            self._hits.inc()
+            return self._data[key][0]
+
+    def set(self, key: t.Hashable, value: t.Any) -> None:
+        """Cache value evicting least recently used values if required.
+
+        Args:
+            key (t.Hashable): Cache key.
+            value (t.Any): Value to be cached.
+        """
+
+        size = self.sizeof(value)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+
+        expires = time.monotonic() + self.ttl if self.ttl > 0 else float("inf")
+        with self._lock:
+            self._pop(key)
+            self._data[key] = (value, size, expires)
+            self.size += size
+
+            while len(self._data) > self.max_entries or self.size > self.max_bytes:
+                self._pop(next(iter(self._data)))
+                self._evictions.inc()
+
+    def delete(self, key: t.Hashable) -> None:
+        """Remove value from cache.
+
+        Args:
+            key (t.Hashable): Cache key.
+        """
+
+        with self._lock:
+            self._pop(key)
+
+    def clear(self) -> None:
+        """Remove all values from cache."""
+        with self._lock:
+            self._data.clear()
+            self.size = 0
+
+    def _pop(self, key: t.Hashable) -> None:
+        """Remove value from cache without locking."""
+        if key in self._data:
+            self.size -= self._data.pop(key)[1]
+
+
+class RedisCache:
+    """Cache in a Redis-compatible server shared by processes and hosts.
+
+    Values are stored as JSON with expiration, so they have to be JSON serializable.
+    Server errors are logged and treated as cache misses.
+    """
+
+    def __init__(self, name: str, url: str, max_bytes: int, ttl: float = 0):
+        """Initialize the RedisCache.
+
+        Args:
+            name (str): Cache name used in keys and prometheus metrics.
+            url (str): Server url like redis://localhost:6379/0.
+            max_bytes (int): Maximum size of a cached value in bytes. Total size
+                is bounded by the server maxmemory policy.
+            ttl (float): Seconds to keep cached values. 0 keeps them until evicted.
+        """
+
+        # Redis client is required only if the cache is enabled
+        import redis  # pylint: disable=import-outside-toplevel
+
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._client = redis.Redis.from_url(url)
+        self._errors = redis.RedisError
+
+        self._hits = CACHE_HITS.labels(name)
+        self._misses = CACHE_MISSES.labels(name)
+
+    def get(self, key: bytes | str, default: t.Any = None) -> t.Any:
+        """Get cached value.
+
+        Args:
+            key (bytes | str): Cache key.
+            default (t.Any): Value to be returned if key is not cached.
+
+        Returns:
+            t.Any:
+                Cached value or default.
+        """
+
+        try:
+            value = self._client.get(self._key(key))
+        except self._errors as exc:
+            logger.warning(f'Failed to get value from "{self.name}" cache: {exc}')
+            value = None
+
+        if value is None:
+            self._misses.inc()
+            return default
+
+        self._hits.inc()
+        return json.loads(value)
+
+    def set(self, key: bytes | str, value: t.Any) -> None:
+        """Cache value with expiration.
+
+        Args:
+            key (bytes | str): Cache key.
+            value (t.Any): Value to be cached.
+        """
+
+        value = json.dumps(value, separators=(",", ":")).encode()
+        if len(value) > self.max_bytes:
+            return
+
+        try:
+            self._client.set(
+                self._key(key), value, px=int(self.ttl * 1000) if self.ttl else None
+            )
+        except self._errors as exc:
+            logger.warning(f'Failed to set value in "{self.name}" cache: {exc}')
+
+    def delete(self, key: bytes | str) -> None:
+        """Remove value from cache.
+
+        Args:
+            key (bytes | str): Cache key.
+        """
+
+        try:
+            self._client.delete(self._key(key))
+        except self._errors as exc:
+            logger.warning(f'Failed to delete value from "{self.name}" cache: {exc}')
+
+    def _key(self, key: bytes | str) -> str:
+        """Prefix key with cache name."""
+        if isinstance(key, bytes):
+            key = key.hex()
+        return f"belinsky:{self.name}:{key}"
@@ -33,3 +33,39 @@ def check_request_keys(
         return response, 400
 
     return False
+
+
+def check_string_lists(**values: t.Any) -> tuple[dict[str, str | int], int] or bool:
+    """Check request values are lists of strings.
+
+    Args:
+        values (t.Any): Request values by their keys.
+
+    Returns:
+        tuple[dict[str, str | int], int] or bool
+    """
+
+    for key, value in values.items():
+        if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+            response = {"error": f"['{key}'] must be a list of strings.", "status": 400}
+            return response, 400
+
+    return False
+
+
+def check_optional_strings(**values: t.Any) -> tuple[dict[str, str | int], int] or bool:
+    """Check request values are strings if given.
+
+    Args:
+        values (t.Any): Request values by their keys.
+
+    Returns:
+        tuple[dict[str, str | int], int] or bool
+    """
+
+    for key, value in values.items():
+        if value is not None and not isinstance(value, str):
+            response = {"error": f"['{key}'] must be a string.", "status": 400}
+            return response, 400
+
+    return False
@@ -15,6 +15,7 @@ class UnknownLanguageError(Exception):
             known_languages (list): Known languages.
         """
 
+        self._args = (language, list(known_languages))
         self.language = format_language_name(language)[0]
         self.known_languages = format_language_name(known_languages)
         self.message = (
@@ -22,3 +23,58 @@ class UnknownLanguageError(Exception):
             f"Please use one of: {', '.join(self.known_languages)}."
         )
         super().__init__(self.message)
+
+    def __reduce__(self):
+        """Pickle error with its initialization arguments."""
+        return self.__class__, self._args
+
+
+class LanguageNotReadyError(Exception):
+    """Language model is not loaded yet error."""
+
+    def __init__(self, language: str):
+        """Initialize a LanguageNotReadyError.
+
+        Args:
+            language (str): Language.
+        """
+
+        self._args = (language,)
+        self.language = format_language_name(language)[0]
+        self.message = (
+            f"{self.language} language is warming up. Please try again in a minute."
+        )
+        super().__init__(self.message)
+
+    def __reduce__(self):
+        """Pickle error with its initialization arguments."""
+        return self.__class__, self._args
+
+
+class UnknownPhraseSetError(Exception):
+    """Unknown phrase set error."""
+
+    def __init__(self, phrase_set_id: t.Any):
+        """Initialize an UnknownPhraseSetError.
+
+        Args:
+            phrase_set_id (t.Any): Phrase set id.
+        """
+
+        self.phrase_set_id = phrase_set_id
+        self.message = f"Unknown phrase set: {phrase_set_id}. Please register it first."
+        super().__init__(self.message)
+
+    def __reduce__(self):
+        """Pickle error with its initialization arguments."""
+        return self.__class__, (self.phrase_set_id,)
+
+
+class NLPPoolUnavailableError(Exception):
+    """NLP pool is not available error."""
+
+    def __init__(self):
+        """Initialize a NLPPoolUnavailableError."""
+
+        self.message = "Phrase Finder is unavailable. Please try again in a minute."
+        super().__init__(self.message)
@@ -0,0 +1,34 @@
+"""Belinsky lazily created objects."""
+import functools
+import threading
+import typing as t
+
+T = t.TypeVar("T")
+
+
+def lazy_object(factory: t.Callable[[], T]) -> t.Callable[[], T]:
+    """Create object on the first call and return the same object on next ones.
+
+    Unlike functools.cache, concurrent first calls wait for a single object
+    instead of creating one each.
+
+    Args:
+        factory (t.Callable): Function creating the object.
+
+    Returns:
+        t.Callable:
+            Function returning the created object.
+    """
+
+    lock = threading.Lock()
+    created: list[T] = []
+
+    @functools.wraps(factory)
+    def get_created() -> T:
+        if not created:
+            with lock:
+                if not created:
+                    created.append(factory())
+        return created[0]
+
+    return get_created
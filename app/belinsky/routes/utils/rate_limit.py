@@ -0,0 +1,56 @@
+"""Belinsky rate limiter."""
+import threading
+import time
+import typing as t
+from collections import OrderedDict
+
+
+# pylint: disable=too-few-public-methods
+class RateLimiter:
+    """Thread-safe token bucket rate limiter of many keys.
+
+    Bucket of every key holds up to max(rate, 1) tokens refilled by rate tokens
+    per second, and every request takes a token. Buckets of least recently used
+    keys are dropped above max_keys, so their keys start with full buckets again.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        """Initialize the RateLimiter.
+
+        Args:
+            max_keys (int): Maximum number of tracked keys.
+        """
+
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[t.Hashable, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: t.Hashable, rate: float) -> float:
+        """Take a token from bucket of key if it's not empty.
+
+        Args:
+            key (t.Hashable): Rate limited key.
+            rate (float): Allowed requests per second of key.
+
+        Returns:
+            float:
+                0 if token was taken, otherwise seconds until the next token.
+        """
+
+        now = time.monotonic()
+        capacity = max(rate, 1)
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+        return wait
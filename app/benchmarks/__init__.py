@@ -0,0 +1 @@
+"""Belinsky benchmarks."""
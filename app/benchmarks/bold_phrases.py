@@ -0,0 +1,44 @@
+"""Benchmark Phrase Finder found phrases highlighting.
+
+Check highlighting time grows linearly with number of found phrases.
+
+Usage:
+    python -m benchmarks.bold_phrases
+"""
+import random
+import time
+
+from belinsky.routes.phrase_finder.formatter import bold_phrases
+
+WORD = "слово "
+HITS_PER_PHRASE = 10
+SIZES = (1_000, 10_000, 100_000)
+
+
+def generate_hits(size: int) -> tuple[str, dict[str, list[list[int]]]]:
+    """Generate text of size words with every word found by one of phrases."""
+    rand = random.Random(size)
+    text = WORD * size
+    phrases: dict[str, list[list[int]]] = {}
+    for index in range(size):
+        start = index * len(WORD)
+        phrase = f"phrase {rand.randrange(size // HITS_PER_PHRASE)}"
+        phrases.setdefault(phrase, []).append([start, start + len(WORD) - 2])
+    return text, phrases
+
+
+def main() -> None:
+    """Run benchmark."""
+    for size in SIZES:
+        text, phrases = generate_hits(size)
+        start = time.perf_counter()
+        bold_phrases(text, phrases)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{size:>7,} hits: {elapsed:.3f}s "
+            f"({elapsed / size * 1e6:.2f}us per hit)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Benchmark PhraseFinder russian hyphened words preprocessing.
+
+Check time and memory of preprocessing grow linearly with text size.
+
+Usage:
+    python -m benchmarks.hyphen_preprocessing
+"""
+import random
+import sys
+import time
+import tracemalloc
+
+from belinsky.routes.phrase_finder import PhraseFinder
+
+WORDS = "мама любит по-настоящему кто-то из-за угла видит во-первых апельсины".split()
+SIZES_MB = (1, 4, 16)
+
+
+def generate_text(size_mb: int) -> str:
+    """Generate russian text of about size_mb megabytes in UTF-8."""
+    rand = random.Random(size_mb)
+    words_number = size_mb * 1024**2 // 16
+    return " ".join(rand.choices(WORDS, k=words_number))
+
+
+def main() -> None:
+    """Run benchmark."""
+    # pylint: disable=protected-access
+    for size_mb in SIZES_MB:
+        text = generate_text(size_mb)
+
+        start = time.perf_counter()
+        PhraseFinder._preprocess_text(text, "ru")
+        elapsed = time.perf_counter() - start
+
+        # Trace memory separately as tracing slows allocations down
+        tracemalloc.start()
+        PhraseFinder._preprocess_text(text, "ru")
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        print(
+            f"{size_mb:>3} MB: {elapsed:.3f}s ({elapsed / size_mb:.3f}s per MB), "
+            f"peak memory x{peak / sys.getsizeof(text):.2f} of text size"
+        )
+
+
+if __name__ == "__main__":
+    main()
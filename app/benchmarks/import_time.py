@@ -0,0 +1,58 @@
+"""Benchmark application cold start.
+
+Measure in fresh interpreters time of importing belinsky, creating application
+and warming up modules workers for every set of enabled modules.
+
+Usage:
+    python -m benchmarks.import_time [--warmup]
+"""
+import json
+import os
+import subprocess
+import sys
+
+MODULES = ["phrase_finder", "text_analyzer", "phrase_finder,text_analyzer"]
+REPEATS = 3
+
+COLD_START = """
+import json, sys, time
+start = time.perf_counter()
+import belinsky
+imported = time.perf_counter()
+belinsky.create_app()
+created = time.perf_counter()
+if "--warmup" in sys.argv:
+    from belinsky import config, routes
+    routes.warmup(config.MODULES)
+warmed_up = time.perf_counter()
+print(json.dumps([imported - start, created - imported, warmed_up - created]))
+"""
+
+
+def cold_start(modules: str, warmup: bool) -> list[float]:
+    """Start application in a new interpreter measuring its stages."""
+    output = subprocess.run(
+        [sys.executable, "-c", COLD_START] + ["--warmup"] * warmup,
+        env={**os.environ, "BELINSKY_MODULES": modules},
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main() -> None:
+    """Run benchmark."""
+    warmup = "--warmup" in sys.argv
+    for modules in MODULES:
+        # Best of repeats excludes cold disk cache of the first run
+        runs = [cold_start(modules, warmup) for _ in range(REPEATS)]
+        imported, created, warmed_up = min(runs, key=sum)
+        print(
+            f"{modules}: import {imported:.2f} s, create_app {created:.2f} s"
+            + (f", warmup {warmed_up:.2f} s" if warmup else "")
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark PhraseFinder phrases lemmatization.
+
+Compare lemmatizing phrases one by one with batched lemmatization.
+Tokens cache is disabled, so duplicated phrases are processed by both.
+
+Usage:
+    python -m benchmarks.phrase_lemmatization
+"""
+import random
+import time
+
+from belinsky.routes.phrase_finder import PhraseFinder
+
+WORDS = {
+    "en": "mother loves oranges and apples while father buys fresh bread".split(),
+    "ru": "мама любит апельсины и яблоки пока папа покупает свежий хлеб".split(),
+}
+SIZES = (10, 100, 10_000)
+
+
+def generate_phrases(language: str, size: int) -> list[str]:
+    """Generate phrases of 1-3 words."""
+    rand = random.Random(size)
+    return [
+        " ".join(rand.choices(WORDS[language], k=rand.randint(1, 3)))
+        for _ in range(size)
+    ]
+
+
+def lemmatize_one_by_one(
+    phrase_finder: PhraseFinder, phrases: list[str], language: str
+) -> list[list[str]]:
+    """Lemmatize phrases calling spaCy for every phrase."""
+    return [phrase_finder.lemmatize(phrase, language) for phrase in phrases]
+
+
+def measure(func, *args) -> float:
+    """Measure function execution time in seconds."""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run benchmark."""
+    phrase_finder = PhraseFinder(cache_max_entries=0)
+
+    for language in WORDS:
+        for size in SIZES:
+            phrases = generate_phrases(language, size)
+            one_by_one = measure(lemmatize_one_by_one, phrase_finder, phrases, language)
+            batched = measure(phrase_finder.lemmatize_many, phrases, language)
+            print(
+                f"{language} {size:>6} phrases: one by one {one_by_one:.3f}s, "
+                f"batched {batched:.3f}s, speedup x{one_by_one / batched:.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
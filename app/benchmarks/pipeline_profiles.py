@@ -0,0 +1,71 @@
+"""Benchmark spaCy pipeline profiles.
+
+Compare tokens per second and lemmas agreement of "minimal" pipeline,
+running only components required by lemmatizer, and "lookup" pipeline,
+running only lookup lemmatizer, with "full" pipeline.
+
+Usage:
+    python -m benchmarks.pipeline_profiles [language ...]
+"""
+import importlib
+import random
+import sys
+import time
+
+from belinsky.routes.phrase_finder import PhraseFinder
+from belinsky.routes.phrase_finder.phrase_finder import PIPELINE_PROFILES
+
+TEXTS_NUMBER = 2_000
+SENTENCES_PER_TEXT = 3
+
+
+def generate_texts(language: str) -> list[str]:
+    """Generate texts from spaCy example sentences of language."""
+    sentences = importlib.import_module(f"spacy.lang.{language}.examples").sentences
+    rand = random.Random(language)
+    return [
+        " ".join(rand.choices(sentences, k=SENTENCES_PER_TEXT))
+        for _ in range(TEXTS_NUMBER)
+    ]
+
+
+def lemmatize(
+    phrase_finder: PhraseFinder, texts: list[str], language: str
+) -> tuple[list[list[str]], float]:
+    """Lemmatize texts measuring tokens per second."""
+    phrase_finder.cache.clear()
+    start = time.perf_counter()
+    lemmatized = phrase_finder.lemmatize_many(texts, language)
+    tokens_number = sum(len(lemmas) for lemmas in lemmatized)
+    return lemmatized, tokens_number / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Run benchmark."""
+    languages = sys.argv[1:] or ["en", "ru"]
+    phrase_finders = {
+        profile: PhraseFinder(preload_languages=languages, pipeline_profile=profile)
+        for profile in PIPELINE_PROFILES
+    }
+
+    for language in languages:
+        texts = generate_texts(language)
+        full_lemmas, full_speed = lemmatize(phrase_finders["full"], texts, language)
+        for profile, phrase_finder in phrase_finders.items():
+            lemmas, speed = lemmatize(phrase_finder, texts, language)
+            pairs = [
+                (full_lemma, lemma)
+                for full_text, text in zip(full_lemmas, lemmas)
+                for full_lemma, lemma in zip(full_text, text)
+            ]
+            agreement = sum(a == b for a, b in pairs) / len(pairs)
+            print(
+                f"{language}: {profile} {speed:,.0f} tokens/s "
+                f"({', '.join(phrase_finder.lemmatizers[language].pipe_names)}), "
+                f"speedup x{speed / full_speed:.1f}, "
+                f"lemmas agreement {agreement:.2%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
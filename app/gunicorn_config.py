@@ -1,5 +1,6 @@
 """Belinsky configuration for gunicorn."""
 # pylint: disable=invalid-name,unused-argument
+import gc
 import os
 import multiprocessing
 
@@ -21,6 +22,20 @@ else:
     workers = multiprocessing.cpu_count() * 2 + 1
     threads = 1
 
+# Let preloaded application know number of workers sharing api tokens rate limits
+os.environ["BELINSKY_NUM_WORKERS"] = str(workers)
+
+# Memory configuration
+# Keep garbage collector from touching preloaded models before fork,
+# so their memory pages stay shared between workers.
+gc_freeze = os.getenv("BELINSKY_GC_FREEZE", "true") == "true"
+if preload_app and gc_freeze:
+    gc.disable()
+
+# Modules workers are created on first request unless warmed up before fork,
+# so preloaded models are shared by workers and first requests aren't slowed down.
+warmup = os.getenv("BELINSKY_WARMUP", "true") == "true"
+
 # Logs configuration
 accesslog = os.getenv("BELINSKY_ACCESS_LOGFILE", "-")
 errorlog = os.getenv("BELINSKY_ERROR_LOGFILE", "-")
@@ -35,6 +50,8 @@ def __repr__():
         "worker_class": worker_class,
         "worker_connections": worker_connections,
         "preload_app": preload_app,
+        "gc_freeze": gc_freeze,
+        "warmup": warmup,
         "accesslog": accesslog,
         "errorlog": errorlog,
     }
@@ -45,6 +62,51 @@ def __repr__():
 logger.info(__repr__())
 
 
+# noinspection PyUnusedLocal
+def on_starting(server):
+    """Start processes of enabled modules, as NLP pool owning spaCy models."""
+    # pylint: disable=import-outside-toplevel
+    from belinsky import config, routes
+
+    routes.on_starting(config.MODULES)
+
+
+# noinspection PyUnusedLocal
+def on_exit(server):
+    """Stop processes of enabled modules."""
+    # pylint: disable=import-outside-toplevel
+    from belinsky import config, routes
+
+    routes.on_exit(config.MODULES)
+
+
+# noinspection PyUnusedLocal
+def when_ready(server):
+    """Warm up enabled modules and freeze preloaded objects before forking workers."""
+    if preload_app and warmup:
+        # pylint: disable=import-outside-toplevel
+        from belinsky import config, routes
+
+        routes.warmup(config.MODULES)
+
+    # Collect garbage of models loading and warmup, so it isn't frozen into pages
+    # shared by workers, then freeze survivors and collect new objects as usual.
+    # Frozen objects are never touched by collections of master and workers.
+    if preload_app and gc_freeze:
+        gc.collect()
+        gc.freeze()
+        gc.enable()
+
+
+# noinspection PyUnusedLocal
+def post_fork(server, worker):
+    """Connect modules clients in forked worker."""
+    # pylint: disable=import-outside-toplevel
+    from belinsky import config, routes
+
+    routes.post_fork(config.MODULES)
+
+
 # noinspection PyUnusedLocal
 def child_exit(server, worker):
     """Mark process dead for correct prometheus metrics."""
@@ -1,7 +1,10 @@
 """Test Belinsky authorization."""
+import pytest
 from flask import Flask
 from flask.testing import FlaskClient
 
+from belinsky import config, database, models
+from belinsky.routes import auth
 from . import credentials, utils
 
 
@@ -65,3 +68,98 @@ def test_logout(client: FlaskClient) -> None:
     response = client.post("/logout", data={"raw": True})
 
     assert response.status_code == 200
+
+
+def test_load_user_cache(app: Flask, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test load_user queries database only for uncached users."""
+    utils.add_user(app, "unittester_1", "test_password")
+    client = app.test_client()
+    client.post(
+        "/login", data={"username": "unittester_1", "password": "test_password"}
+    )
+    with app.app_context():
+        user_id = str(database.get_instance(models.User, username="unittester_1").id)
+    auth.user_cache.clear()
+
+    client.get("/")
+    monkeypatch.setattr(database, "get_instance", lambda *args, **kwargs: None)
+    response = client.get("/")
+    monkeypatch.undo()
+
+    assert response.status_code == 200
+    assert user_id in auth.user_cache
+
+    client.post(
+        "delete-user", json={"username": "unittester_1", "password": "test_password"}
+    )
+    assert user_id not in auth.user_cache
+
+
+def test_api_token(app: Flask) -> None:
+    """Test api token authenticates requests to its scopes without session."""
+    client = app.test_client()
+    response = client.post(
+        "/api-tokens", json=credentials | {"scopes": ["phrase_finder"]}
+    )
+    assert response.status_code == 200
+    headers = {"Authorization": f"Bearer {response.json['token']}"}
+
+    response = client.post(
+        "/phrase-sets", json={"phrases": ["мама"], "language": "ru"}, headers=headers
+    )
+    assert response.status_code == 200
+    assert "Set-Cookie" not in response.headers
+
+    response = client.post("/text-analyzer/batch", json={"texts": []}, headers=headers)
+    assert response.status_code == 403
+
+    response = client.post(
+        "/phrase-sets",
+        json={"phrases": ["мама"]},
+        headers={"Authorization": "Bearer 1"},
+    )
+    assert response.status_code == 401
+
+    response = client.post("/api-tokens", json=credentials | {"scopes": [["a"]]})
+    assert response.status_code == 400
+
+    response = client.post("/api-tokens", json=credentials | {"rate_limit": True})
+    assert response.status_code == 400
+
+
+def test_api_token_deleted_user(app: Flask) -> None:
+    """Test api tokens of deleted users are rejected."""
+    utils.add_user(app, "unittester_1", "test_password")
+    client = app.test_client()
+    response = client.post(
+        "/api-tokens", json={"username": "unittester_1", "password": "test_password"}
+    )
+    headers = {"Authorization": f"Bearer {response.json['token']}"}
+    client.post(
+        "delete-user", json={"username": "unittester_1", "password": "test_password"}
+    )
+
+    response = client.post("/text-analyzer/batch", json={"texts": []}, headers=headers)
+
+    assert response.status_code == 401
+
+
+def test_api_token_rate_limit(app: Flask, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test api token requests are rate limited by its key in every worker."""
+    monkeypatch.setattr(config, "NUM_WORKERS", 2)
+    client = app.test_client()
+    response = client.post("/api-tokens", json=credentials | {"rate_limit": 0.01})
+    headers = {"Authorization": f"Bearer {response.json['token']}"}
+
+    responses = [
+        client.post(
+            "/phrase-finder/batch",
+            json={"texts": [], "phrases": ["мама"], "language": "ru"},
+            headers=headers,
+        )
+        for _ in range(2)
+    ]
+
+    assert responses[0].status_code == 200
+    assert responses[1].status_code == 429
+    assert int(responses[1].headers["Retry-After"]) > 190
@@ -1,11 +1,31 @@
 """Test Belinsky Phrase Finder"""
-from flask import Flask
-from flask.testing import FlaskClient
+import json
+import pickle
+from pathlib import Path
 
-from belinsky.routes.phrase_finder import phrase_finder_worker
-from belinsky.routes.phrase_finder.phrase_finder import Token
+import numpy as np
+import pytest
+import spacy
+from flask import Flask
+from flask.testing import FlaskClient, FlaskCliRunner
+from prometheus_client import REGISTRY
+
+from belinsky.routes import phrase_finder as phrase_finder_module
+from belinsky.routes.phrase_finder import get_phrase_finder_worker
+from belinsky.routes.phrase_finder.formatter import bold_phrases
+from belinsky.routes.phrase_finder.lemma_cache import LemmaCache
+from belinsky.routes.phrase_finder.matcher import PhraseMatcher
+from belinsky.routes.phrase_finder.pool import NLPPool, RemotePhraseFinder
+from belinsky.routes.phrase_finder.phrase_finder import PhraseFinder, Token
+from belinsky.routes.utils import (
+    LRUCache,
+    NLPPoolUnavailableError,
+    UnknownLanguageError,
+)
 from . import utils
 
+phrase_finder_worker = get_phrase_finder_worker()
+
 
 # Test Phrase Finder worker
 def test_lemmatizer() -> None:
@@ -22,6 +42,17 @@ def test_lemmatizer_hyphen() -> None:
     assert response == correct_response
 
 
+def test_preprocess_hyphens() -> None:
+    """Test russian hyphened words preprocessing keeps offsets."""
+    # pylint: disable=protected-access
+    text = "из-за кого-то-там ---"
+    response = PhraseFinder._preprocess_text(text, "ru")
+
+    correct_response = "   за         там ---"
+    assert response == correct_response
+    assert len(response) == len(text)
+
+
 def test_lemmatizer_phrase() -> None:
     """Test lemmatizer from Phrase Finder with russian phrase."""
     response = phrase_finder_worker.lemmatize("а он обожает", "ru")
@@ -43,6 +74,81 @@ def test_lemmatizer_en() -> None:
     assert response == correct_response
 
 
+def test_lemmatizer_many() -> None:
+    """Test batched lemmatizer from Phrase Finder with russian phrases."""
+    response = phrase_finder_worker.lemmatize_many(
+        ["Апельсины", "по-любому", "а он обожает"], "ru"
+    )
+    correct_response = [["апельсин"], ["любой"], ["а", "он", "обожать"]]
+    assert response == correct_response
+
+
+def test_lemmatizer_cache() -> None:
+    """Test Phrase Finder caches processed texts."""
+    phrase_finder_worker.cache.clear()
+    phrase_finder_worker.lemmatize("Апельсины", "ru")
+    response = phrase_finder_worker.lemmatize_many(["Апельсины", "Апельсины"], "ru")
+
+    assert response == [["апельсин"], ["апельсин"]]
+    assert len(phrase_finder_worker.cache) == 1
+
+
+def test_load_language_failed(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test failed language model load is kept until retry interval passes."""
+    phrase_finder = PhraseFinder(preload_languages=(), model_load_timeout=1)
+    loaded_languages = []
+
+    def load_model(language: str) -> None:
+        loaded_languages.append(language)
+        raise FileNotFoundError(language)
+
+    monkeypatch.setattr(phrase_finder, "_load_model", load_model)
+    for _ in range(3):
+        with pytest.raises(UnknownLanguageError):
+            phrase_finder.lemmatize("Hallo Welt", "de")
+    assert loaded_languages == ["de"]
+
+    phrase_finder.model_retry_interval = 0
+    with pytest.raises(UnknownLanguageError):
+        phrase_finder.lemmatize("Hallo Welt", "de")
+    assert loaded_languages == ["de", "de"]
+
+
+def test_minimal_pipeline() -> None:
+    """Test minimal pipeline keeps only components required by lemmatizer."""
+    response = {}
+    for mode in ("lookup", "rule"):
+        nlp = spacy.blank("en")
+        for component in ("tok2vec", "tagger", "attribute_ruler", "parser", "ner"):
+            nlp.add_pipe(component)
+        nlp.add_pipe("lemmatizer", config={"mode": mode})
+        PhraseFinder._trim_pipeline(nlp)  # pylint: disable=protected-access
+        response[mode] = nlp.component_names
+
+    correct_response = {
+        "lookup": ["lemmatizer"],
+        "rule": ["tok2vec", "tagger", "attribute_ruler", "lemmatizer"],
+    }
+    assert response == correct_response
+
+
+def test_lookup_pipeline() -> None:
+    """Test lookup pipeline runs only lemmatizer in lookup mode."""
+    nlp = spacy.blank("en")
+    for component in ("tok2vec", "tagger", "attribute_ruler", "parser", "ner"):
+        nlp.add_pipe(component)
+    nlp.add_pipe("lemmatizer", config={"mode": "rule"})
+    PhraseFinder._use_lookup_lemmatizer(nlp)  # pylint: disable=protected-access
+
+    assert nlp.component_names == ["lemmatizer"]
+    assert nlp.get_pipe("lemmatizer").mode == "lookup"
+    assert [token.lemma_ for token in nlp("children were running")] == [
+        "child",
+        "be",
+        "run",
+    ]
+
+
 def test_detect_language_ru() -> None:
     """Test detect language with russian phrase."""
     response = phrase_finder_worker.detect_language("Это русский текст")
@@ -57,6 +163,66 @@ def test_detect_language_en() -> None:
     assert response == correct_response
 
 
+def test_detect_language_latin() -> None:
+    """Test detect language of latin script languages."""
+    response = [
+        phrase_finder_worker.detect_language(text)
+        for text in [
+            "Der Hund schläft unter dem Tisch",
+            "Le chien dort sous la table",
+            "El perro duerme debajo de la mesa",
+        ]
+    ]
+    correct_response = ["de", "fr", "es"]
+    assert response == correct_response
+
+
+def test_detect_language_cyrillic_word() -> None:
+    """Test detect language of single cyrillic words."""
+    response = [
+        phrase_finder_worker.detect_language(text)
+        for text in ["Олимпиада", "Университет"]
+    ]
+    assert response == ["ru", "ru"]
+
+
+def test_detect_language_short_en() -> None:
+    """Test detect language of short english phrases."""
+    response = [
+        phrase_finder_worker.detect_language(text)
+        for text in [
+            "Hello world",
+            "children run",
+            "child",
+            "find phrases",
+            "Apple stock rises",
+            "phrase finder",
+        ]
+    ]
+    assert response == ["en"] * 6
+
+
+def test_detect_language_short_unexpected() -> None:
+    """Test short texts of not expected languages fall back to default language."""
+    response = [
+        phrase_finder_worker.detect_language(text)
+        for text in ["Wasser", "maison", "Hallo Welt"]
+    ]
+    assert response == ["en"] * 3
+
+
+def test_language_detector_cache() -> None:
+    """Test language detector reports confidence and caches results."""
+    detector = phrase_finder_worker.language_detector
+    detector.cache.clear()
+    language, confidence = detector.detect("Это русский текст")
+    detector.detect("Это русский текст")
+
+    assert language == "ru"
+    assert 0 < confidence <= 1
+    assert len(detector.cache) == 1
+
+
 def test_tokenizer() -> None:
     """Test tokenizer from Phrase Finder."""
     response = [
@@ -71,6 +237,30 @@ def test_tokenizer() -> None:
     assert response == correct_response
 
 
+def test_tokens() -> None:
+    """Test columnar tokens storage."""
+    tokens = phrase_finder_worker.tokenize("Мама обожает апельсины", "ru")
+    restored = pickle.loads(pickle.dumps(tokens))
+
+    assert len(tokens) == 3
+    assert tokens[-1].to_list() == ("апельсины", "апельсин", (13, 21))
+    assert restored.words == ["Мама", "обожает", "апельсины"]
+    assert restored.lemmas == ["мама", "обожать", "апельсин"]
+    assert tokens.nbytes > 0
+    assert tokens[1:3].words == ["обожает", "апельсины"]
+    assert [token.lemma for token in tokens[::-2]] == ["апельсин", "мама"]
+
+
+def test_tokenizer_lemma_hashes() -> None:
+    """Test tokenizer carries lemmas hashes used in phrases matching."""
+    tokens = phrase_finder_worker.tokenize("Мама, обожает апельсины!", "ru")
+    response = [token.lemma_hash for token in tokens]
+
+    strings = phrase_finder_worker.lemmatizers["ru"].vocab.strings
+    correct_response = [strings[lemma] for lemma in ["мама", "обожать", "апельсин"]]
+    assert response == correct_response
+
+
 def test_find_phrases() -> None:
     """Test find_phrases from Phrase Finder."""
     response = phrase_finder_worker.find_phrases("Привет, я Папа", ["я папа"], "ru")
@@ -79,6 +269,130 @@ def test_find_phrases() -> None:
     assert response == correct_response
 
 
+def test_phrase_matcher_overlapping() -> None:
+    """Test PhraseMatcher with overlapping and nested phrases."""
+    matcher = PhraseMatcher({"ab": ["a", "b"], "bab": ["b", "a", "b"], "b": ["b"]})
+    response = matcher.find(["a", "b", "a", "b"])
+
+    correct_response = [[(0, 1), (2, 3)], [(1, 3)], [(1, 1), (3, 3)]]
+    assert response == correct_response
+
+
+def test_phrase_matcher_hashes() -> None:
+    """Test PhraseMatcher with lemmas hashes not found in phrases."""
+    matcher = PhraseMatcher({"ab": np.array([1, 2**63], dtype=np.uint64)})
+    response = matcher.find(np.array([1, 3, 2**63, 1, 2**63], dtype=np.uint64))
+
+    correct_response = [[(3, 4)]]
+    assert response == correct_response
+
+
+def test_nlp_pool(tmp_path: Path) -> None:
+    """Test find_phrases with texts processed in NLP pool."""
+    address = str(tmp_path / "nlp.sock")
+    pool = NLPPool(address, 1, b"test", lambda: phrase_finder_worker)
+    pool.start()
+    try:
+        remote_worker = RemotePhraseFinder(address, b"test")
+        response = remote_worker.find_phrases("Привет, я Папа", ["я папа"], "ru")
+        # pylint: disable=protected-access
+        connection = remote_worker._get_connection()
+        languages = remote_worker.detect_languages(
+            ["Привет, я Папа", "This is english text"]
+        )
+        assert remote_worker._get_connection() is connection
+    finally:
+        pool.stop()
+
+    correct_response = {"я папа": [[8, 13]]}
+    assert response == correct_response
+    assert languages == ["ru", "en"]
+
+
+def test_nlp_pool_unavailable(
+    tmp_path: Path, client: FlaskClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test Phrase Finder responds with 503 when NLP pool is not running."""
+    remote_worker = RemotePhraseFinder(str(tmp_path / "nlp.sock"), b"test")
+    with pytest.raises(NLPPoolUnavailableError):
+        remote_worker.detect_language("Привет, я Папа")
+
+    monkeypatch.setattr(
+        phrase_finder_module, "get_phrase_finder_worker", lambda: remote_worker
+    )
+    response = client.post(
+        "/phrase-finder/batch", json={"texts": ["мама"], "phrases": ["мама"]}
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "30"
+
+
+def test_result_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test find_phrases responds with cached result skipping spaCy."""
+    monkeypatch.setattr(
+        phrase_finder_worker,
+        "result_cache",
+        LRUCache("test_results", max_entries=10, max_bytes=1024**2, ttl=60),
+    )
+    phrase_finder_worker.find_phrases("Мама любит апельсины", ["мама", "любит"], "ru")
+
+    def fail(*_) -> None:
+        raise AssertionError("spaCy is used on cache hit.")
+
+    monkeypatch.setattr(phrase_finder_worker, "_get_lemmatizer", fail)
+    response = phrase_finder_worker.find_phrases(
+        "Мама любит апельсины", ["любит", "мама", "любит"], "ru"
+    )
+
+    correct_response = {"любит": [[5, 9]], "мама": [[0, 3]]}
+    assert response == correct_response
+    assert list(response) == ["любит", "мама"]
+
+
+def test_lemma_cache(
+    runner: FlaskCliRunner, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test compile_phrases takes lemmas from on-disk cache skipping spaCy."""
+    phrases_path = tmp_path / "phrases.txt"
+    phrases_path.write_text("Мама любит\nапельсины\n", encoding="utf-8")
+    cache_path = str(tmp_path / "lemmas.bin")
+    result = runner.invoke(
+        args=[
+            "phrase_finder",
+            "build-lemma-cache",
+            "--output",
+            cache_path,
+            "--language",
+            "ru",
+            str(phrases_path),
+        ]
+    )
+    assert result.exit_code == 0, result.output
+
+    def fail(*_) -> None:
+        raise AssertionError("spaCy is used for cached phrases.")
+
+    monkeypatch.setattr(phrase_finder_worker, "lemma_cache", LemmaCache(cache_path))
+    monkeypatch.setattr(phrase_finder_worker, "_process_texts", fail)
+    matcher = phrase_finder_worker.compile_phrases(["апельсины", "Мама любит"], "ru")
+    monkeypatch.undo()
+
+    response = phrase_finder_worker.match_phrases("Мама любит апельсины", matcher, "ru")
+    correct_response = {"апельсины": [[11, 19]], "Мама любит": [[0, 9]]}
+    assert response == correct_response
+
+
+def test_bold_phrases_overlaps() -> None:
+    """Test bold_phrases highlights overlapping phrases as one span."""
+    text = "мама любит папу\r\nи папа любит"
+    phrases = {"мама любит": [[0, 9]], "любит папу": [[5, 14], [24, 28]]}
+    response = bold_phrases(text, phrases)
+
+    correct_response = "<b>мама любит папу</b><br>и папа <b>любит</b>"
+    assert response == correct_response
+
+
 # Test phrase finder
 def test_phrase_finder_template(app: Flask, client: FlaskClient) -> None:
     """Test Phrase Finder template."""
@@ -145,7 +459,8 @@ def test_phrase_finder_hyphen(client: FlaskClient) -> None:
 
 
 def test_phrase_finder_de_without_preload(client: FlaskClient) -> None:
-    """Test Phrase Finder with unknown language."""
+    """Test Phrase Finder with language loaded in background."""
+    phrase_finder_worker.load_language("de").result()
     response = client.post(
         "/phrase-finder",
         data={
@@ -168,3 +483,154 @@ def test_phrase_finder_unknown_language(client: FlaskClient) -> None:
 
     assert response.status_code == 200
     assert "Unknown language" in response.get_data(as_text=True)
+
+
+def test_phrase_sets(client: FlaskClient) -> None:
+    """Test Phrase Finder with registered phrase set."""
+    response = client.post(
+        "/phrase-sets", json={"phrases": ["хотеть", "апельсин"], "language": "ru"}
+    )
+    assert response.status_code == 200
+
+    response = client.post(
+        "/phrase-finder",
+        data={
+            "text": "мама хочет апельсины",
+            "phrase_set": response.json["phrase_set"],
+            "raw": True,
+        },
+    )
+
+    assert response.status_code == 200
+    assert {"апельсин": [[11, 19]], "хотеть": [[5, 9]]} == response.json[
+        "found_phrases"
+    ]
+
+
+def test_phrase_sets_unknown(client: FlaskClient) -> None:
+    """Test Phrase Finder with unknown phrase set."""
+    response = client.post(
+        "/phrase-finder",
+        data={"text": "мама хочет апельсины", "phrase_set": "unknown"},
+    )
+
+    assert response.status_code == 200
+    assert "Unknown phrase set" in response.get_data(as_text=True)
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"phrases": 5},
+        {"phrases": [1]},
+        {"phrases": [1], "language": "en"},
+        {"phrases": ["a"], "language": 5},
+    ],
+)
+def test_phrase_sets_invalid(client: FlaskClient, body: dict) -> None:
+    """Test phrase sets with invalid phrases or language are not registered."""
+    response = client.post("/phrase-sets", json=body)
+
+    assert response.status_code == 400
+
+
+def test_phrase_sets_other_user(app: Flask, client: FlaskClient) -> None:
+    """Test Phrase Finder with phrase set registered by other user."""
+    response = client.post("/phrase-sets", json={"phrases": ["мама"], "language": "ru"})
+    phrase_set_id = response.json["phrase_set"]
+
+    utils.add_user(app, "unittester_1", "test_password")
+    other_client = app.test_client()
+    other_client.post(
+        "/login", data={"username": "unittester_1", "password": "test_password"}
+    )
+    response = other_client.post(
+        "/phrase-finder",
+        data={"text": "мама хочет апельсины", "phrase_set": phrase_set_id},
+    )
+    utils.delete_user(app, "unittester_1")
+
+    assert response.status_code == 200
+    assert "Unknown phrase set" in response.get_data(as_text=True)
+
+
+def test_phrase_finder_batch(client: FlaskClient) -> None:
+    """Test Phrase Finder batch with russian texts."""
+    response = client.post(
+        "/phrase-finder/batch",
+        json={
+            "texts": ["мама хочет апельсины", "Клара у карла украла кораллы"],
+            "phrases": ["хотеть", "коралл"],
+            "language": "ru",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json["found_phrases"] == [
+        {"хотеть": [[5, 9]], "коралл": []},
+        {"хотеть": [], "коралл": [[21, 27]]},
+    ]
+
+
+def test_phrase_finder_batch_invalid_texts(client: FlaskClient) -> None:
+    """Test Phrase Finder batch with texts not being list of strings."""
+    for texts in ({"text": "мама"}, ["мама", 1], [["мама"]]):
+        response = client.post(
+            "/phrase-finder/batch",
+            json={"texts": texts, "phrases": ["мама"], "language": "ru"},
+        )
+
+        assert response.status_code == 400
+        assert response.json["error"] == "['texts'] must be a list of strings."
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"phrases": ["мама"], "language": 5},
+        {"phrases": ["мама"], "language": ["ru"]},
+        {"phrase_set": [1]},
+        {"phrase_set": {"id": 1}},
+    ],
+)
+def test_phrase_finder_batch_invalid_options(client: FlaskClient, body: dict) -> None:
+    """Test Phrase Finder batch with language or phrase set of invalid type."""
+    response = client.post("/phrase-finder/batch", json={"texts": ["мама"]} | body)
+
+    assert response.status_code == 400
+
+
+def test_phrase_finder_stream(client: FlaskClient) -> None:
+    """Test Phrase Finder stream with russian NDJSON documents."""
+    documents = [
+        {"id": "first", "text": "мама хочет апельсины"},
+        "Клара у карла украла кораллы",
+        "not json",
+    ]
+    response = client.post(
+        "/phrase-finder/stream?phrases=хотеть&phrases=коралл&language=ru",
+        data="\n".join(
+            d if d == "not json" else json.dumps(d, ensure_ascii=False)
+            for d in documents
+        ),
+        buffered=False,
+    )
+    streams_number = REGISTRY.get_sample_value("phrase_finder_stream_latency_count")
+
+    assert response.status_code == 200
+    body = response.get_data(as_text=True)
+    response.close()
+    assert (
+        REGISTRY.get_sample_value("phrase_finder_stream_latency_count")
+        == streams_number + 1
+    )
+    results = [json.loads(line) for line in body.split("\n") if line]
+    assert results[0] == {
+        "id": "first",
+        "found_phrases": {"хотеть": [[5, 9]], "коралл": []},
+    }
+    assert results[1] == {
+        "id": 1,
+        "found_phrases": {"хотеть": [], "коралл": [[21, 27]]},
+    }
+    assert results[2]["id"] == 2 and results[2]["status"] == 400
@@ -1,10 +1,29 @@
 """Test Belinsky Text Analyzer"""
+import html
+import json
+import threading
+import time
+import typing as t
+from pathlib import Path
+
+import pytest
 from flask import Flask
-from flask.testing import FlaskClient
+from flask.testing import FlaskClient, FlaskCliRunner
+from google.api_core import exceptions
+from google.cloud import language_v1 as api
+from prometheus_client import REGISTRY
 
-from belinsky.routes.text_analyzer import text_analyzer_worker
+from belinsky.routes import text_analyzer
+from belinsky.routes.text_analyzer import (
+    GoogleCloudBackend,
+    LocalBackend,
+    TextAnalyzer,
+    get_text_analyzer_worker,
+)
 from . import utils
 
+text_analyzer_worker = get_text_analyzer_worker()
+
 TEXT = (
     "In spectra of the Active Galactic Nuclei (AGNs), the [N II]λλ 6548, 6583 Å lines are commonly "
     "fitted using the fixed intensity ratio of these two lines (R[NII] = I6583/I6548). However, the"
@@ -24,6 +43,120 @@ def test_classify_text() -> None:
     assert response == TEXT_TYPE
 
 
+def test_classify_texts_concurrency() -> None:
+    """Test classify_texts calls api concurrently with bounded concurrency."""
+    lock = threading.Lock()
+    calls = {"running": 0, "max_running": 0}
+
+    def classify(request: api.ClassifyTextRequest) -> api.ClassifyTextResponse:
+        with lock:
+            calls["running"] += 1
+            calls["max_running"] = max(calls["max_running"], calls["running"])
+        time.sleep(0.05)
+        with lock:
+            calls["running"] -= 1
+        return api.ClassifyTextResponse(
+            categories=[{"name": f"/{request.document.content}", "confidence": 1}]
+        )
+
+    with utils.fake_language_service(classify) as address:
+        worker = TextAnalyzer(GoogleCloudBackend(None, address, max_concurrency=4))
+        texts = [str(index) for index in range(12)]
+        response = [
+            result.categories[0].name[1:] for result in worker.classify_texts(texts)
+        ]
+
+    assert response == texts
+    assert calls["max_running"] == 4
+
+
+def test_classify_texts_cache() -> None:
+    """Test classify_texts calls api once for the same texts."""
+    calls = []
+
+    def classify(request: api.ClassifyTextRequest) -> api.ClassifyTextResponse:
+        calls.append(request.document.content)
+        time.sleep(0.05)
+        return api.ClassifyTextResponse(
+            categories=[{"name": f"/{TEXT_TYPE}", "confidence": 0.5}]
+        )
+
+    with utils.fake_language_service(classify) as address:
+        worker = TextAnalyzer(GoogleCloudBackend(None, address))
+        first_response = worker.classify_texts([TEXT] * 5)
+        second_response = worker.classify_text(TEXT)
+
+    assert calls == [TEXT]
+    assert all(response == second_response for response in first_response)
+    assert second_response.categories[0].name[1:] == TEXT_TYPE
+
+
+def test_classify_texts_channels() -> None:
+    """Test classify_texts spreads api calls over channels with deadline."""
+
+    def classify(request: api.ClassifyTextRequest) -> api.ClassifyTextResponse:
+        time.sleep(float(request.document.content))
+        return api.ClassifyTextResponse(
+            categories=[{"name": f"/{TEXT_TYPE}", "confidence": 0.5}]
+        )
+
+    def calls_number(channel: str) -> float:
+        return (
+            REGISTRY.get_sample_value(
+                "text_analyzer_channel_latency_seconds_count", {"channel": channel}
+            )
+            or 0
+        )
+
+    with utils.fake_language_service(classify) as address:
+        backend = GoogleCloudBackend(None, address, channels=3, timeout=0.5)
+        worker = TextAnalyzer(backend)
+        worker.connect()
+        calls_before = [calls_number(str(channel)) for channel in range(3)]
+        response = worker.classify_texts(
+            ["0.01", "0.02", "0.03", "0.04", "0.05", "1"], return_exceptions=True
+        )
+        calls = [
+            calls_number(str(channel)) - calls_before[channel] for channel in range(3)
+        ]
+
+    assert all(result.categories for result in response[:5])
+    assert isinstance(response[5], exceptions.DeadlineExceeded)
+    assert calls == [2, 2, 2]
+
+
+def test_local_backend(runner: FlaskCliRunner, tmp_path: Path) -> None:
+    """Test local backend trained with cli classifies texts in-process."""
+    samples = [
+        {"text": TEXT, "category": f"/{TEXT_TYPE}"},
+        {"text": "The team won the football match in overtime.", "category": "/Sports"},
+        {"text": "Players scored two goals in the second half.", "category": "/Sports"},
+    ]
+    dataset_path = tmp_path / "dataset.jsonl"
+    dataset_path.write_text("\n".join(map(json.dumps, samples)), encoding="utf-8")
+    model_path = str(tmp_path / "model.npz")
+    result = runner.invoke(
+        args=[
+            "text_analyzer",
+            "train-local-model",
+            str(dataset_path),
+            "--output",
+            model_path,
+        ]
+    )
+    assert result.exit_code == 0, result.output
+
+    worker = TextAnalyzer(LocalBackend(model_path))
+    response = worker.classify_texts(
+        ["Fixed intensity ratio of spectra lines", "Football players scored", "!"],
+        return_exceptions=True,
+    )
+
+    assert response[0].categories[0].name[1:] == TEXT_TYPE
+    assert response[1].categories[0].name[1:] == "Sports"
+    assert isinstance(response[2], exceptions.InvalidArgument)
+
+
 # Test Text Analyzer
 def test_text_analyzer_template(app: Flask, client: FlaskClient) -> None:
     """Test Text Analyzer template."""
@@ -44,3 +177,68 @@ def test_text_analyzer_post(app: Flask, client: FlaskClient) -> None:
         assert response.status_code == 200
         assert len(templates) == 1
         assert f"<b>{TEXT_TYPE}</b>" in templates[0][1]["analyzis"]
+
+
+@pytest.mark.parametrize(
+    "message, flashed",
+    [
+        (
+            "The language lt is not supported for document_classification.",
+            "Unknown language: lt.",
+        ),
+        (
+            "Invalid text content: too few tokens (words) to process.",
+            "Invalid text content: too few tokens (words) to process.",
+        ),
+    ],
+)
+def test_text_analyzer_post_invalid_argument(
+    client: FlaskClient, monkeypatch: pytest.MonkeyPatch, message: str, flashed: str
+) -> None:
+    """Test Text Analyzer flashes unknown language or invalid argument message."""
+
+    def classify(request: api.ClassifyTextRequest) -> api.ClassifyTextResponse:
+        raise exceptions.InvalidArgument(message)
+
+    with utils.fake_language_service(classify) as address:
+        worker = TextAnalyzer(GoogleCloudBackend(None, address))
+        monkeypatch.setattr(text_analyzer, "get_text_analyzer_worker", lambda: worker)
+        response = client.post(
+            "/text-analyzer", data={"text": TEXT, "analyzis_type": "Classify text"}
+        )
+
+    assert response.status_code == 200
+    assert html.escape(flashed) in response.get_data(as_text=True)
+
+
+def test_text_analyzer_batch(
+    client: FlaskClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test Text Analyzer batch with errors of some texts."""
+
+    def classify(request: api.ClassifyTextRequest) -> api.ClassifyTextResponse:
+        if len(request.document.content) < 3:
+            raise exceptions.InvalidArgument("Too few tokens.")
+        return api.ClassifyTextResponse(
+            categories=[{"name": f"/{TEXT_TYPE}", "confidence": 0.5}]
+        )
+
+    with utils.fake_language_service(classify) as address:
+        worker = TextAnalyzer(GoogleCloudBackend(None, address))
+        monkeypatch.setattr(text_analyzer, "get_text_analyzer_worker", lambda: worker)
+        response = client.post("/text-analyzer/batch", json={"texts": [TEXT, "Hi"]})
+
+    correct_response = [
+        {"categories": [{"name": f"/{TEXT_TYPE}", "confidence": 0.5}]},
+        {"error": "Too few tokens.", "status": 406},
+    ]
+    assert response.status_code == 200
+    assert response.json["analyzis_results"] == correct_response
+
+
+@pytest.mark.parametrize("texts", [5, [1], [], [TEXT, None]])
+def test_text_analyzer_batch_invalid_texts(client: FlaskClient, texts: t.Any) -> None:
+    """Test Text Analyzer batch rejects texts not being a non-empty list of strings."""
+    response = client.post("/text-analyzer/batch", json={"texts": texts})
+
+    assert response.status_code == 400
@@ -0,0 +1,108 @@
+"""Test Belinsky routes utils."""
+import sys
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from belinsky.routes.utils import LRUCache, RateLimiter, RedisCache, lazy_object
+from . import utils
+
+
+def test_lru_cache_max_entries() -> None:
+    """Test LRUCache evicts least recently used value."""
+    cache = LRUCache("test_max_entries", max_entries=2, max_bytes=1024)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "a" in cache and "c" in cache
+    assert cache.get("b") is None
+
+
+def test_lru_cache_max_bytes() -> None:
+    """Test LRUCache is bounded by values size."""
+    cache = LRUCache("test_max_bytes", max_entries=10, max_bytes=10, sizeof=len)
+    cache.set("a", "12345")
+    cache.set("b", "123456")
+    cache.set("c", "12345678901")
+
+    assert len(cache) == 1 and cache.size == 6
+    assert cache.get("b") == "123456"
+
+
+def test_lru_cache_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test LRUCache expires values."""
+    cache = LRUCache("test_ttl", max_entries=10, max_bytes=1024, ttl=60)
+    cache.set("a", 1)
+    monkeypatch.setattr(time, "monotonic", lambda: float("inf"))
+
+    assert cache.get("a") is None
+    assert len(cache) == 0 and cache.size == 0
+
+
+def test_redis_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test RedisCache stores JSON values with expiration."""
+    redis = types.SimpleNamespace(
+        Redis=utils.FakeRedis, RedisError=utils.FakeRedisError
+    )
+    monkeypatch.setitem(sys.modules, "redis", redis)
+    cache = RedisCache("test_redis", "redis://localhost:6379/0", 20, ttl=60)
+    cache.set(b"a", {"phrase": [[0, 5]]})
+    cache.set("b", "12345678901234567890")
+
+    assert cache.get(b"a") == {"phrase": [[0, 5]]}
+    assert cache.get("b") is None
+    assert cache.get("c", "missed") == "missed"
+
+    cache.delete(b"a")
+    assert cache.get(b"a") is None
+
+    cache.set("d", 1)
+    monkeypatch.setattr(time, "monotonic", lambda: float("inf"))
+    assert cache.get("d") is None
+
+
+def test_redis_cache_unavailable(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test RedisCache treats unavailable server as cache misses."""
+    redis = types.SimpleNamespace(
+        Redis=utils.FakeRedis, RedisError=utils.FakeRedisError
+    )
+    monkeypatch.setitem(sys.modules, "redis", redis)
+    cache = RedisCache("test_redis_down", "redis://down:6379/0", 1024)
+    cache.set("a", 1)
+    cache.delete("a")
+
+    assert cache.get("a", "missed") == "missed"
+
+
+def test_lazy_object() -> None:
+    """Test lazy_object creates a single object on concurrent first calls."""
+    created = []
+
+    @lazy_object
+    def get_object() -> object:
+        time.sleep(0.1)
+        created.append(object())
+        return created[-1]
+
+    with ThreadPoolExecutor(4) as executor:
+        objects = list(executor.map(lambda _: get_object(), range(4)))
+
+    assert len(created) == 1
+    assert all(obj is created[0] for obj in objects)
+
+
+def test_rate_limiter(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test RateLimiter allows bursts and refills buckets by rate."""
+    limiter = RateLimiter()
+    monkeypatch.setattr(time, "monotonic", lambda: 0.0)
+
+    assert [limiter.acquire("a", 2) for _ in range(3)] == [0, 0, 0.5]
+    assert limiter.acquire("b", 2) == 0
+
+    monkeypatch.setattr(time, "monotonic", lambda: 0.5)
+    assert limiter.acquire("a", 2) == 0
+    assert limiter.acquire("a", 2) == 0.5
@@ -1,7 +1,13 @@
 """Belinsky tests utils."""
+import time
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 
+import grpc
 from flask import Flask, template_rendered
+from google.api_core import exceptions
+from google.cloud import language_v1 as api
 
 from belinsky import database, models
 
@@ -25,6 +31,82 @@ def captured_templates(app):
         template_rendered.disconnect(record, app)
 
 
+# Utils to fake Google Cloud NLP api
+@contextmanager
+def fake_language_service(
+    classify: t.Callable[[api.ClassifyTextRequest], api.ClassifyTextResponse]
+) -> t.Iterator[str]:
+    """Run local gRPC server answering ClassifyText calls with classify.
+
+    Google api errors raised by classify are returned as gRPC statuses.
+    """
+
+    def classify_text(request, context):
+        try:
+            return classify(request)
+        except exceptions.GoogleAPICallError as exc:
+            return context.abort(exc.grpc_status_code, exc.message)
+
+    handler = grpc.method_handlers_generic_handler(
+        "google.cloud.language.v1.LanguageService",
+        {
+            "ClassifyText": grpc.unary_unary_rpc_method_handler(
+                classify_text,
+                request_deserializer=api.ClassifyTextRequest.deserialize,
+                response_serializer=api.ClassifyTextResponse.serialize,
+            )
+        },
+    )
+    server = grpc.server(ThreadPoolExecutor(max_workers=32))
+    server.add_generic_rpc_handlers([handler])
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    try:
+        yield f"localhost:{port}"
+    finally:
+        server.stop(None)
+
+
+# Utils to fake Redis client
+class FakeRedisError(Exception):
+    """Fake Redis client error."""
+
+
+class FakeRedis:
+    """Redis client keeping values in memory, unavailable for "down" urls."""
+
+    def __init__(self, available: bool):
+        """Initialize the FakeRedis."""
+        self.available = available
+        self.values: dict[str, tuple[bytes, float]] = {}
+
+    @classmethod
+    def from_url(cls, url: str) -> "FakeRedis":
+        """Create client of server url."""
+        return cls("down" not in url)
+
+    def get(self, key: str) -> bytes | None:
+        """Get value if it's not expired."""
+        self._check_connection()
+        value, expires = self.values.get(key, (None, float("inf")))
+        return value if time.monotonic() < expires else None
+
+    def set(self, key: str, value: bytes, px: int | None = None) -> None:
+        """Set value expiring in px milliseconds."""
+        self._check_connection()
+        expires = time.monotonic() + px / 1000 if px else float("inf")
+        self.values[key] = (value, expires)
+
+    def delete(self, key: str) -> None:
+        """Delete value."""
+        self._check_connection()
+        self.values.pop(key, None)
+
+    def _check_connection(self) -> None:
+        if not self.available:
+            raise FakeRedisError("Error 111 connecting to server. Connection refused.")
+
+
 # Utils to interact with app database
 def add_user(_app: Flask, username: str, password: str) -> None:
     """Add user model to database."""